@@ -1,10 +1,30 @@
-from flask import Flask, send_from_directory, jsonify, request
+from time import perf_counter
+_import_started = perf_counter()
+
+from flask import Flask, Blueprint, current_app, send_from_directory, send_file, jsonify, request
 from flask_cors import CORS
+from json_provider import MongoJSONProvider
 import os
-from pymongo import MongoClient
+from threading import Thread, Lock
 from dotenv import load_dotenv
 from datetime import datetime
 from bson import ObjectId
+from config import Config
+from cache import invalidate
+from sequences import allocate_id
+from models import submitted_questions_collection, faqs_collection, ensure_indexes
+from db import get_client, get_db
+import images
+import assets
+import compression
+import metrics
+import coherence
+import slow_queries
+import search
+import related
+import ingest
+from ratelimit import rate_limit
+from auth import auth_required
 
 # Import blueprints
 from routes.home import home_bp
@@ -18,11 +38,15 @@ from routes.testimonials import testimonials_bp
 from routes.clients import clients_bp
 from routes.faqs import faqs_bp
 from routes.admin import admin_bp
+from routes.pages import pages_bp
+from routes.search import search_bp
 
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
+_imports_ms = (perf_counter() - _import_started) * 1000
+
+# Routes that live on the app itself rather than in routes/
+core_bp = Blueprint('core', __name__)
 
 # @app.after_request
 # def add_security_headers(response):
@@ -38,7 +62,6 @@ CORS(app)
 #         "frame-src *;"
 #     )
 #     return response
-@app.after_request
 def add_security_headers(response):
     response.headers['Content-Security-Policy'] = (
         "default-src 'self'; "
@@ -50,88 +73,168 @@ def add_security_headers(response):
     )
     return response
 
-# MongoDB
-mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/elve_agency')
-client = MongoClient(mongo_uri)
-db = client.get_database(os.getenv('MONGODB_DBNAME', 'elve_agency'))
-print("✅ Connected to MongoDB!......")
-
-# Register blueprints
-app.register_blueprint(home_bp, url_prefix='/api')
-app.register_blueprint(about_bp, url_prefix='/api')
-app.register_blueprint(services_bp, url_prefix='/api')
-app.register_blueprint(projects_bp, url_prefix='/api')
-app.register_blueprint(pricing_bp, url_prefix='/api')
-app.register_blueprint(blogs_bp, url_prefix='/api')
-app.register_blueprint(testimonials_bp, url_prefix='/api')
-app.register_blueprint(contact_bp, url_prefix='/api')
-app.register_blueprint(clients_bp, url_prefix='/api')
-app.register_blueprint(faqs_bp, url_prefix='/api')
-app.register_blueprint(admin_bp, url_prefix='/api/')
-
-@app.route('/')
+
+def create_app():
+    """Build the Flask app without touching MongoDB.
+
+    The connection is opened and indexes are created by warm_up(), which runs
+    in the background after fork (see gunicorn.conf.py) or on the first request.
+    """
+    started = perf_counter()
+    app = Flask(__name__)
+    app.json = MongoJSONProvider(app)
+    metrics.init_app(app)
+    CORS(app, expose_headers=['X-Next-Cursor'])
+    app.after_request(add_security_headers)
+    app.after_request(compression.compress_response)
+
+    # Register blueprints
+    app.register_blueprint(core_bp)
+    app.register_blueprint(home_bp, url_prefix='/api')
+    app.register_blueprint(about_bp, url_prefix='/api')
+    app.register_blueprint(services_bp, url_prefix='/api')
+    app.register_blueprint(projects_bp, url_prefix='/api')
+    app.register_blueprint(pricing_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    app.register_blueprint(testimonials_bp, url_prefix='/api')
+    app.register_blueprint(contact_bp, url_prefix='/api')
+    app.register_blueprint(clients_bp, url_prefix='/api')
+    app.register_blueprint(faqs_bp, url_prefix='/api')
+    app.register_blueprint(pages_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api/')
+
+    app.before_request(lambda: warm_up(app))
+
+    manifest_started = perf_counter()
+    assets.build_manifest(os.path.join(app.root_path, 'static'))
+
+    app.config['BOOT_TIMINGS'] = {
+        'imports_ms': round(_imports_ms, 2),
+        'asset_manifest_ms': round((perf_counter() - manifest_started) * 1000, 2),
+        'create_app_ms': round((perf_counter() - started) * 1000, 2),
+    }
+    return app
+
+
+_warm_lock = Lock()
+_warmed_pid = None
+
+def warm_up(app):
+    """Connect to MongoDB and ensure indexes in a background thread, once per process."""
+    global _warmed_pid
+    if _warmed_pid == os.getpid():
+        return
+    with _warm_lock:
+        if _warmed_pid == os.getpid():
+            return
+        _warmed_pid = os.getpid()
+    Thread(target=_connect, args=(app,), daemon=True).start()
+
+def _connect(app):
+    timings = app.config['BOOT_TIMINGS']
+    try:
+        started = perf_counter()
+        get_client().admin.command('ping')
+        timings['mongo_connect_ms'] = round((perf_counter() - started) * 1000, 2)
+        print("✅ Connected to MongoDB!......")
+
+        started = perf_counter()
+        ensure_indexes()
+        slow_queries.ensure_store()
+        timings['ensure_indexes_ms'] = round((perf_counter() - started) * 1000, 2)
+
+        # Submissions spilled to disk while MongoDB was unreachable
+        ingest.replay()
+
+        # Follow writes made by other workers from here on
+        coherence.start()
+
+        started = perf_counter()
+        search.build()
+        timings['search_index_ms'] = round((perf_counter() - started) * 1000, 2)
+
+        started = perf_counter()
+        related.ensure_built()
+        timings['related_ms'] = round((perf_counter() - started) * 1000, 2)
+    except Exception as e:
+        # Routes report their own errors; the app keeps serving what it can
+        print(f"❌ MongoDB warm-up failed: {e}")
+
+
+@core_bp.route('/')
 def index():
     return "Elve Agency Backend API"
 
+def _send_asset(kind, filename):
+    asset, immutable = assets.lookup(kind, filename)
+    if asset is None:
+        # Not in the boot manifest (e.g. added since); 404s if it doesn't exist
+        static_dir = os.path.join(current_app.root_path, 'static', kind)
+        return send_from_directory(static_dir, filename)
+
+    if immutable:
+        response = send_file(asset['path'], mimetype=asset['mimetype'],
+                             etag=asset['hash'], max_age=Config.ASSET_IMMUTABLE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+    return send_file(asset['path'], mimetype=asset['mimetype'], etag=asset['hash'])
+
 # Static files - Serve images from static/images directory
-@app.route('/images/<path:filename>')
+@core_bp.route('/images/<path:filename>')
 def serve_images(filename):
     # Remove any leading 'images/' from the filename if present
     if filename.startswith('images/'):
         filename = filename[7:]  # Remove the first 7 characters ('images/')
-    
-    # Try to serve from static/images first
-    static_images_dir = os.path.join(app.root_path, 'static', 'images')
-    
-    # Check if the file exists in static/images
-    if os.path.exists(os.path.join(static_images_dir, filename)):
-        return send_from_directory(static_images_dir, filename)
-    
-    # If not found, try other possible locations
-    possible_dirs = [
-        # os.path.join(app.root_path, 'data', 'images'),
-        # os.path.join(app.root_path, '..', 'data', 'images'),
-        # os.path.join(app.root_path, '..', 'frontend', 'public', 'images'),
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images'),
-        # os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'images'),
-    ]
-    
-    for images_dir in possible_dirs:
-        if os.path.exists(os.path.join(images_dir, filename)):
-            return send_from_directory(images_dir, filename)
-    
-    # If not found in any directory, return 404
-    return "Image not found", 404
+
+    width = request.args.get('w', type=int)
+    fmt = request.args.get('format')
+    if (width or fmt) and images.variants_available():
+        asset, immutable = assets.lookup('images', filename)
+        if asset is None:
+            return "Image not found", 404
+        if fmt and fmt.lower() not in images.FORMATS:
+            return "Unsupported image format", 400
+        if not images.has_variants(asset['path']):
+            return _send_asset('images', filename)
+        variant_path, mimetype = images.get_variant(asset['path'], width, fmt, asset['hash'])
+        max_age = Config.ASSET_IMMUTABLE_MAX_AGE if immutable else Config.IMAGE_VARIANT_MAX_AGE
+        response = send_file(variant_path, mimetype=mimetype, max_age=max_age)
+        response.cache_control.public = True
+        response.cache_control.immutable = immutable
+        return response
+
+    return _send_asset('images', filename)
 
 # Add a route for JavaScript files if needed
-@app.route('/js/<path:filename>')
+@core_bp.route('/js/<path:filename>')
 def serve_js(filename):
-    js_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'js')
-    return send_from_directory(js_dir, filename)
+    return _send_asset('js', filename)
 
-@app.route('/css/<path:filename>')
+@core_bp.route('/css/<path:filename>')
 def serve_css(filename):
-    css_dir = os.path.join(app.root_path, 'static', 'css')
-    return send_from_directory(css_dir, filename)
+    return _send_asset('css', filename)
 
-@app.route('/admin-panel')
+@core_bp.route('/assets/manifest.json')
+def asset_manifest():
+    return jsonify(assets.manifest())
+
+@core_bp.route('/admin-panel')
 def serve_admin_panel():
     return send_from_directory('../frontend/public', 'admin-panel.html')
 
 # FAQ submission route for visitors
-@app.route('/api/submit-question', methods=['POST'])
+@core_bp.route('/api/submit-question', methods=['POST'])
+@rate_limit(per_ip='5/minute', total='50/second')
 def submit_question():
     try:
-        data = request.get_json()
-        if not data or 'question' not in data:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not str(data.get('question') or '').strip():
             return jsonify({'error': 'Question is required'}), 400
         
-        # Get the next ID
-        last_question = db.submitted_questions.find_one(sort=[("id", -1)])
-        next_id = last_question['id'] + 1 if last_question else 1
-        
+        # The integer id is assigned when the queued batch is written
         question_data = {
-            'id': next_id,
             'question': data['question'],
             'email': data.get('email', ''),
             'created_at': datetime.utcnow(),
@@ -140,37 +243,36 @@ def submit_question():
             'answered_at': None
         }
         
-        result = db.submitted_questions.insert_one(question_data)
+        question_id = ingest.submit(submitted_questions_collection, question_data)
         return jsonify({
             'message': 'Question submitted successfully',
-            'id': next_id
-        }), 201
+            '_id': str(question_id)
+        }), 202
+    except ingest.QueueFull:
+        return ingest.busy({'error': 'Too many submissions right now, please try again shortly'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Route to get unanswered questions for admin
-@app.route('/api/admin/submitted-questions')
+@core_bp.route('/api/admin/submitted-questions')
+@auth_required
 def get_submitted_questions():
     try:
-        questions = list(db.submitted_questions.find({"answered": False}))
-        for question in questions:
-            question['_id'] = str(question['_id'])
-            # Convert datetime to string for JSON serialization
-            if 'created_at' in question and isinstance(question['created_at'], datetime):
-                question['created_at'] = question['created_at'].isoformat()
+        questions = submitted_questions_collection.find({"answered": False})
         return jsonify(questions), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Route for admin to answer a question
-@app.route('/api/admin/answer-question/<question_id>', methods=['PUT'])
+@core_bp.route('/api/admin/answer-question/<question_id>', methods=['PUT'])
+@auth_required
 def answer_question(question_id):
     try:
         data = request.get_json()
         if not data or 'answer' not in data:
             return jsonify({'error': 'Answer is required'}), 400
         
-        result = db.submitted_questions.update_one(
+        result = submitted_questions_collection.update_one(
             {'id': int(question_id)},
             {'$set': {
                 'answer': data['answer'],
@@ -184,11 +286,10 @@ def answer_question(question_id):
         
         # Add the answered question to the FAQs collection
         # Get the next FAQ ID
-        last_faq = db.faqs.find_one(sort=[("id", -1)])
-        next_faq_id = last_faq['id'] + 1 if last_faq else 1
+        next_faq_id = allocate_id(faqs_collection)
         
         # Get the question data
-        question_data = db.submitted_questions.find_one({'id': int(question_id)})
+        question_data = submitted_questions_collection.find_one({'id': int(question_id)})
         
         # Create FAQ entry
         faq_data = {
@@ -198,17 +299,19 @@ def answer_question(question_id):
             'open': False
         }
         
-        db.faqs.insert_one(faq_data)
+        faqs_collection.insert_one(faq_data)
+        invalidate('faqs')
+        search.refresh('faqs', {'id': next_faq_id})
             
         return jsonify({'message': 'Question answered successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Debug routes
-@app.route('/debug/routes')
+@core_bp.route('/debug/routes')
 def debug_routes():
     routes = []
-    for rule in app.url_map.iter_rules():
+    for rule in current_app.url_map.iter_rules():
         routes.append({
             'endpoint': rule.endpoint,
             'methods': list(rule.methods),
@@ -216,15 +319,16 @@ def debug_routes():
         })
     return jsonify(routes)
 
-@app.route('/debug/env')
+@core_bp.route('/debug/env')
 def debug_env():
     env_vars = {key: value for key, value in os.environ.items() if 'MONGO' in key or 'FLASK' in key}
     return jsonify(env_vars)
 
-@app.route('/debug/db')
+@core_bp.route('/debug/db')
 def debug_db():
     try:
-        client.admin.command('ping')
+        get_client().admin.command('ping')
+        db = get_db()
         collections = db.list_collection_names()
         return jsonify({
             'status': 'connected',
@@ -234,5 +338,11 @@ def debug_db():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@core_bp.route('/debug/boot')
+def debug_boot():
+    return jsonify(current_app.config['BOOT_TIMINGS'])
+
+app = create_app()
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5001, host='0.0.0.0')
\ No newline at end of file
+    app.run(debug=True, port=5001, host='0.0.0.0')
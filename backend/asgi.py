@@ -0,0 +1,270 @@
+"""Optional ASGI entry point with an async read path.
+
+Public content GETs are answered here with the async MongoDB driver, so a
+worker serves many requests at once and a page bundle's collections are read
+concurrently. They share cache.py's response cache, content versions and
+ETags with the Flask views. Every other request (writes, admin, images,
+/metrics, ...) is handed to the regular Flask app. URLs and response bodies
+are the same.
+
+Run from backend/ (needs `pip install -r requirements-async.txt` at the repo root):
+    uvicorn asgi:app --host 0.0.0.0 --port 5001 --workers 4
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from time import perf_counter
+from bson import ObjectId
+from bson.errors import InvalidId
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header, parse_etags
+from app import app as flask_app, add_security_headers, warm_up
+from content import ABOUT_DEFAULT
+from db import get_async_db
+from models import related_collection
+from routes.blogs import list_query
+from routes.pages import PAGE_BUNDLES
+import cache
+import compression
+import metrics
+import related
+
+flask_wsgi = WSGIMiddleware(flask_app)
+
+# Page sections stored as a single document rather than a list
+SINGLE_DOCUMENT = {'home', 'about'}
+# Sections content.py seeds on first read; left to Flask while they are empty
+SEEDED = {'home', 'services', 'pricing'}
+
+
+class Fallback(Exception):
+    """Let the Flask view answer instead, e.g. to seed an empty collection."""
+
+
+def _finish(request, response):
+    origin = request.headers.get('origin')
+    if origin:
+        # Same answer Flask-CORS gives the Flask routes
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Expose-Headers'] = 'X-Next-Cursor'
+    return add_security_headers(response)
+
+
+def _json_response(request, data, status=200, headers=None):
+    # Errors only; 200s go through the response cache
+    body = flask_app.json.dumps(data).encode('utf-8')
+    return _finish(request, Response(body, status, headers=headers, media_type='application/json'))
+
+
+def _cached_response(request, entry, etag):
+    """A cache.py entry as a response, compressed the way cached() would."""
+    body = entry['body']
+    headers = dict(entry['headers'])
+    accepted = parse_accept_header(request.headers.get('accept-encoding'), Accept)
+    encoding = compression.choose_encoding(entry['mimetype'], len(body), accepted)
+    if encoding:
+        body = cache.encoded(entry, encoding)
+        headers['Content-Encoding'] = encoding
+        etag = f'{etag}-{encoding}'
+    headers.update({'ETag': f'"{etag}"', 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'})
+    return _finish(request, Response(body, 200, headers=headers, media_type=entry['mimetype']))
+
+
+def _not_modified(request, etag):
+    return _finish(request, Response(status_code=304, headers={
+        'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}))
+
+
+async def _find_all(name, query=None):
+    return await get_async_db()[name].find(query or {}, {'_id': 0}).to_list(None)
+
+
+async def _find_first(name):
+    return await get_async_db()[name].find_one({}, {'_id': 0})
+
+
+# -------------------------------
+# HANDLERS
+# -------------------------------
+async def get_home(request):
+    home = await _find_first('home')
+    if not home:
+        raise Fallback()
+    return home
+
+
+async def get_about(request):
+    return await get_async_db()['about'].find_one() or ABOUT_DEFAULT
+
+
+def _list(name, seeded_by_flask=False):
+    async def handler(request):
+        docs = await _find_all(name)
+        if not docs and seeded_by_flask:
+            raise Fallback()
+        return docs
+    return handler
+
+
+async def get_projects(request):
+    category = request.query_params.get('category', 'All Blog')
+    try:
+        if category == 'All Blog':
+            return await _find_all('projects')
+        return await _find_all('projects', {'category': category})
+    except Exception:
+        return {'error': 'Internal server error'}, 500
+
+
+async def get_filters(request):
+    try:
+        return ['All Blog'] + await get_async_db()['projects'].distinct('category')
+    except Exception:
+        return {'error': 'Internal server error'}, 500
+
+
+async def get_blogs(request):
+    try:
+        query, projection, limit = list_query(request.query_params)
+    except InvalidId:
+        return {'error': 'Invalid blog ID or cursor'}, 400
+    cursor = get_async_db()['blogs'].find(query, projection).sort('_id', 1)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    blogs = await cursor.to_list(None)
+    if limit is not None and len(blogs) == limit:
+        return blogs, 200, {'X-Next-Cursor': str(blogs[-1]['_id'])}
+    return blogs
+
+
+async def get_blog(request):
+    blog = await get_async_db()['blogs'].find_one({'_id': ObjectId(request.path_params['id'])})
+    if not blog:
+        return {'error': 'Blog not found'}, 404
+    return blog
+
+
+def _related(name):
+    async def handler(request):
+        row = await get_async_db()[related_collection.name].find_one(
+            related.row_filter(name, request.path_params['id']), {'items': 1})
+        # Same ?limit= handling as the Flask routes
+        return related.limited(row['items'] if row else [], request.query_params.get('limit'))
+    return handler
+
+
+def _page(sections):
+    async def load(name):
+        if name in SINGLE_DOCUMENT:
+            doc = await _find_first(name)
+            return doc or (ABOUT_DEFAULT if name == 'about' else {})
+        return await _find_all(name)
+
+    async def handler(request):
+        # All sections in flight at once: one round trip of latency, not N
+        results = dict(zip(sections, await asyncio.gather(*(load(name) for name in sections))))
+        if any(not results[name] for name in SEEDED.intersection(sections)):
+            raise Fallback()
+        return results
+    return handler
+
+
+class AsyncView:
+    """ASGI app for one route: runs the handler, or defers to Flask on Fallback.
+
+    Handlers return data, (data, status) or (data, status, headers). A 200 is
+    cached until one of `collections` changes, exactly as cached() does for
+    the Flask view. Requests are recorded in /metrics under the Flask
+    endpoint name.
+    """
+
+    def __init__(self, endpoint, handler, collections):
+        self.endpoint = endpoint
+        self.handler = handler
+        self.collections = tuple(collections)
+
+    async def _respond(self, request):
+        key = cache.cache_key(request.url.path, request.query_params.multi_items())
+        versions, entry = cache.lookup(key, self.collections)
+        etag = cache.etag_for(versions)
+        if cache.etag_matches(parse_etags(request.headers.get('if-none-match')), etag):
+            return _not_modified(request, etag)
+        if entry is None:
+            try:
+                result = await self.handler(request)
+            except Fallback:
+                raise
+            except Exception as e:
+                result = ({'error': str(e)}, 500)
+            data, status, headers = result, 200, None
+            if isinstance(result, tuple):
+                data, status, headers = (result + (None,))[:3]
+            if status != 200:
+                return _json_response(request, data, status, headers)
+            entry = cache.store(key, self.collections, versions,
+                                flask_app.json.dumps(data).encode('utf-8'), 'application/json',
+                                (headers or {}).items())
+        return _cached_response(request, entry, etag)
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        started = perf_counter()
+        token = metrics.current_endpoint.set(self.endpoint)
+        try:
+            response = await self._respond(request)
+        except Fallback:
+            await flask_wsgi(scope, receive, send)
+            return
+        finally:
+            metrics.current_endpoint.reset(token)
+
+        labels = {'endpoint': self.endpoint}
+        metrics.observe('http_request_duration_seconds', labels, perf_counter() - started,
+                        metrics.LATENCY_BUCKETS)
+        metrics.observe('http_response_size_bytes', labels, len(response.body), metrics.SIZE_BUCKETS)
+        metrics.inc('http_requests_total', {**labels, 'method': request.method,
+                                            'status': str(response.status_code)})
+        await response(scope, receive, send)
+
+
+def _route(path, endpoint, handler, *collections):
+    return Route(path, AsyncView(endpoint, handler, collections), methods=['GET'])
+
+
+# Cached under the same collections as the @cached() Flask views
+routes = [
+    _route('/api/home', 'home.get_home', get_home, 'home'),
+    _route('/api/about', 'about.get_about', get_about, 'about'),
+    _route('/api/services', 'services.get_services', _list('services', seeded_by_flask=True), 'services'),
+    _route('/api/projects', 'projects.get_projects', get_projects, 'projects'),
+    _route('/api/projects/{id}/related', 'projects.get_related_projects', _related('projects'),
+           related.cache_name('projects')),
+    _route('/api/filters', 'projects.get_filters', get_filters, 'projects'),
+    _route('/api/pricing', 'pricing.get_pricing', _list('pricing', seeded_by_flask=True), 'pricing'),
+    _route('/api/testimonials', 'testimonials.get_testimonials', _list('testimonials'), 'testimonials'),
+    _route('/api/clients', 'clients.get_clients', _list('clients'), 'clients'),
+    _route('/api/faqs', 'faqs.get_faqs', _list('faqs'), 'faqs'),
+    _route('/api/contact/faqs', 'contact.get_contact_faqs', _list('faqs'), 'faqs'),
+    _route('/api/blogs', 'blogs_bp.get_blogs', get_blogs, 'blogs'),
+    _route('/api/blogs/{id}', 'blogs_bp.get_blog', get_blog, 'blogs'),
+    _route('/api/blogs/{id}/related', 'blogs_bp.get_related_blogs', _related('blogs'),
+           related.cache_name('blogs')),
+    *(_route(f'/api/pages/{page}', f'pages.{page}', _page(sections), *sections)
+      for page, sections in PAGE_BUNDLES.items()),
+    # Everything else, including other methods on the paths above
+    Mount('/', app=flask_wsgi),
+]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Same per-worker warm-up the Flask app runs on its first request
+    warm_up(flask_app)
+    yield
+
+
+app = Starlette(routes=routes, lifespan=lifespan)
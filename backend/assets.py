@@ -0,0 +1,83 @@
+import hashlib
+import mimetypes
+import os
+import re
+
+# Manifest of everything under static/images, static/js and static/css, built
+# once at boot. Lookups are dict hits; nothing here touches the filesystem per
+# request. Each file is also reachable under a fingerprinted name,
+# e.g. /images/Frame (4).3f2a9c1d2b4e.png, which is safe to cache forever.
+
+KINDS = ('images', 'js', 'css')
+
+_assets = {}          # (kind, name) -> entry
+_fingerprinted = {}   # (kind, fingerprinted name) -> entry
+_digest = ''          # of every name and content hash; '' until the manifest is built
+
+
+def _fingerprint(name, digest):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+
+def build_manifest(static_dir):
+    global _digest
+    assets, fingerprinted = {}, {}
+    for kind in KINDS:
+        root = os.path.join(static_dir, kind)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()[:12]
+                fingerprinted_name = _fingerprint(name, digest)
+                entry = {
+                    'path': path,
+                    'hash': digest,
+                    'mimetype': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                    'url': f"/{kind}/{fingerprinted_name}",
+                }
+                assets[(kind, name)] = entry
+                fingerprinted[(kind, fingerprinted_name)] = entry
+
+    _assets.clear()
+    _assets.update(assets)
+    _fingerprinted.clear()
+    _fingerprinted.update(fingerprinted)
+    _digest = hashlib.sha1(repr(sorted(
+        (key, entry['hash']) for key, entry in assets.items())).encode()).hexdigest()[:8]
+    return len(assets)
+
+
+def digest():
+    """Changes whenever a file is added, removed or edited; the same on every worker."""
+    return _digest
+
+
+def lookup(kind, name):
+    """Return (entry, immutable) for a logical or fingerprinted name, or (None, False)."""
+    entry = _fingerprinted.get((kind, name))
+    if entry is not None:
+        return entry, True
+    return _assets.get((kind, name)), False
+
+
+def manifest():
+    return {f"{kind}/{name}": entry['url'] for (kind, name), entry in _assets.items()}
+
+
+_image_path = re.compile(rb'"/images/([^"\\]+)"')
+
+def _replace(match):
+    entry = _assets.get(('images', match.group(1).decode('utf-8', 'replace')))
+    if entry is None:
+        return match.group(0)
+    return b'"' + entry['url'].encode() + b'"'
+
+
+def fingerprint_urls(body):
+    """Rewrite "/images/<name>" strings in a JSON body to their fingerprinted URL."""
+    if not _assets or b'"/images/' not in body:
+        return body
+    return _image_path.sub(_replace, body)
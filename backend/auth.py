@@ -1,39 +1,157 @@
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from functools import wraps
-from flask import request, jsonify
-import os
-from dotenv import load_dotenv
+from threading import Lock
 import jwt
-from datetime import datetime
+from flask import request, jsonify, g
+from config import Config
+from models import revoked_tokens_collection
+import coherence
+import metrics
+
+# The one admin auth layer. Tokens are HS256 JWTs from issue_token(), or the
+# static ADMIN_TOKEN if one is configured. A verified token is remembered in a
+# bounded LRU keyed by its SHA-256 digest until its `exp`, so after the first
+# request the admin panel's calls (and its /admin/verify checks) skip both
+# the HMAC check and the revocation lookup.
+#
+# Revoked tokens are kept in revoked_tokens until they would have expired
+# anyway. Other workers hear about a revocation through coherence.py and
+# forget every token they had verified; with CONTENT_VERSIONS_MODE=off nothing
+# is announced, so cached tokens are still looked up in revoked_tokens. The
+# static ADMIN_TOKEN can't be revoked, only unset.
+
+REVOKED = 'revoked_tokens'
+
+_verified = OrderedDict()   # digest -> (exp, claims)
+_lock = Lock()
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _is_static(token):
+    return bool(Config.ADMIN_TOKEN) and hmac.compare_digest(
+        token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8'))
+
+
+def _revoked(digest):
+    return revoked_tokens_collection.find_one({'_id': digest}, {'_id': 1}) is not None
+
+
+def issue_token(subject):
+    return jwt.encode({
+        'sub': subject,
+        'exp': datetime.utcnow() + timedelta(seconds=Config.JWT_TTL_SECONDS)
+    }, Config.JWT_SECRET, algorithm='HS256')
+
+
+def verify(token):
+    """Claims of a valid, unrevoked token; raises jwt.InvalidTokenError otherwise."""
+    digest = _digest(token)
+    claims = None
+    with _lock:
+        entry = _verified.get(digest)
+        if entry is not None:
+            if entry[0] > time.time():
+                _verified.move_to_end(digest)
+                claims = entry[1]
+            else:
+                del _verified[digest]
+    if claims is not None:
+        metrics.inc('auth_token_cache_total', {'result': 'hit'})
+        # No coherence, no word of other workers' revocations: still skips the HMAC
+        if not coherence.enabled() and _revoked(digest):
+            with _lock:
+                _verified.pop(digest, None)
+            raise jwt.InvalidTokenError('Token has been revoked')
+        return claims
+    metrics.inc('auth_token_cache_total', {'result': 'miss'})
+
+    if _is_static(token):
+        return {'sub': 'admin-token'}
+
+    claims = jwt.decode(token, Config.JWT_SECRET, algorithms=['HS256'],
+                        options={'require': ['exp']})
+    if _revoked(digest):
+        raise jwt.InvalidTokenError('Token has been revoked')
+
+    with _lock:
+        _verified[digest] = (claims['exp'], claims)
+        _verified.move_to_end(digest)
+        while len(_verified) > Config.AUTH_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return claims
+
+
+def revoke(token):
+    """Reject `token` from now on, in this worker and (shortly after) every other.
+
+    Raises ValueError for the static ADMIN_TOKEN, which stays valid while set.
+    """
+    if _is_static(token):
+        raise ValueError('ADMIN_TOKEN cannot be revoked; unset it to stop accepting it')
+    digest = _digest(token)
+    try:
+        exp = jwt.decode(token, Config.JWT_SECRET, algorithms=['HS256'],
+                         options={'verify_exp': False}).get('exp')
+    except jwt.InvalidTokenError:
+        exp = None
+    expires_at = (datetime.utcfromtimestamp(exp) if exp
+                  else datetime.utcnow() + timedelta(seconds=Config.JWT_TTL_SECONDS))
+    # The TTL index drops the entry once the token couldn't be used anyway
+    revoked_tokens_collection.update_one(
+        {'_id': digest}, {'$set': {'expires_at': expires_at}}, upsert=True)
+
+    with _lock:
+        _verified.pop(digest, None)
+    if coherence.enabled():
+        try:
+            coherence.bump([REVOKED])
+        except Exception as e:
+            print(f"❌ Could not publish token revocation: {e}")
+
+
+def _on_change(changed, baseline):
+    # A token was revoked in another worker; re-verify everything once
+    if REVOKED in changed and not baseline:
+        with _lock:
+            _verified.clear()
+
+
+coherence.on_change(_on_change)
 
-load_dotenv()
 
 def auth_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         auth_header = request.headers.get('Authorization')
-        
+
         if not auth_header:
             return jsonify({'error': 'Authorization header missing'}), 401
-            
+
+        token = auth_header.partition(' ')[2].strip()  # Bearer TOKEN
+        if not token:
+            return jsonify({'error': 'Invalid authorization header'}), 401
+
         try:
-            # Simple token-based authentication
-            token = auth_header.split(' ')[1]  # Bearer TOKEN
-            
-            # Try to verify JWT token first
-            try:
-                decoded = jwt.decode(token, os.getenv('JWT_SECRET', 'secret_key'), algorithms=['HS256'])
-                # Check if token is expired
-                if datetime.utcnow() > datetime.fromtimestamp(decoded['exp']):
-                    return jsonify({'error': 'Token expired'}), 401
-                return f(*args, **kwargs)
-            except jwt.InvalidTokenError:
-                # Fall back to simple token comparison
-                expected_token = os.getenv('ADMIN_TOKEN', 'default_admin_token')
-                if token != expected_token:
-                    return jsonify({'error': 'Invalid token'}), 401
-                
+            g.admin = verify(token)
+            g.admin_token = token
+        except jwt.ExpiredSignatureError:
+            return jsonify({'error': 'Token expired'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'error': 'Invalid token'}), 401
         except Exception as e:
-            return jsonify({'error': 'Invalid authorization header'}), 401
-            
+            return jsonify({'error': str(e)}), 500
+
         return f(*args, **kwargs)
-    return decorated
\ No newline at end of file
+    return decorated
+
+
+metrics.HELP_EXTRA.update({
+    'auth_token_cache_total': ('counter', 'Admin token checks answered from the verified-token cache (hit) or verified (miss)'),
+})
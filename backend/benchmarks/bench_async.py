@@ -0,0 +1,142 @@
+"""Requests in flight per worker: gunicorn sync workers vs the ASGI read path.
+
+Starts `gunicorn app:app` (sync worker class) and `uvicorn asgi:app` with the
+same number of worker processes against a seeded benchmark database, then
+drives the public read endpoints at increasing client concurrency. Reports
+p50/p95/p99 latency and requests/sec per server and concurrency level as JSON.
+
+Needs a real MongoDB (the async driver can't use mongomock) and
+requirements-async.txt. Run from backend/:
+    python -m benchmarks.bench_async
+    python -m benchmarks.bench_async --concurrency 1,16,64 --workers 2 -o async.json
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.bench_endpoints import seed, summarize, _git_commit
+from config import Config
+
+PATHS = [
+    '/api/pages/home',
+    '/api/pages/about',
+    '/api/services',
+    '/api/projects',
+    '/api/testimonials',
+    '/api/faqs',
+    '/api/blogs?limit=10',
+]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/faqs')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def _servers(workers):
+    return {
+        'gunicorn-sync': lambda port: ['gunicorn', '-w', str(workers), '-k', 'sync',
+                                       '-b', f'127.0.0.1:{port}', 'app:app'],
+        'uvicorn-asgi': lambda port: ['uvicorn', 'asgi:app', '--workers', str(workers),
+                                      '--host', '127.0.0.1', '--port', str(port),
+                                      '--log-level', 'warning'],
+    }
+
+
+def drive(port, concurrency, requests):
+    local = threading.local()
+
+    def call(i):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection('127.0.0.1', port)
+        t = time.perf_counter()
+        conn.request('GET', PATHS[i % len(PATHS)])
+        conn.getresponse().read()
+        return time.perf_counter() - t
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(min(50, requests))))  # warm connections and pools
+        started = time.perf_counter()
+        latencies = list(pool.map(call, range(requests)))
+        return summarize(latencies, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='elve_agency_bench',
+                        help='database to (re)create; must contain "bench"')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes per server')
+    parser.add_argument('--concurrency', default='1,8,32,64',
+                        help='comma-separated client concurrency levels')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per level')
+    parser.add_argument('--with-cache', action='store_true',
+                        help='keep the Flask response cache on (off by default so both servers hit MongoDB)')
+    parser.add_argument('-o', '--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if 'bench' not in args.db:
+        parser.error('--db must contain "bench"; it is dropped before seeding')
+
+    Config.MONGODB_DBNAME = args.db
+    from db import get_db
+    database = get_db()
+    database.client.drop_database(args.db)
+    seed(database, argparse.Namespace(services=20, projects=200, testimonials=20, faqs=50,
+                                      blogs=1000, contacts=0, questions=0))
+
+    env = {**os.environ, 'MONGODB_DBNAME': args.db, 'RATE_LIMIT_ENABLED': '0',
+           'RESPONSE_CACHE_ENABLED': '1' if args.with_cache else '0'}
+    levels = [int(c) for c in args.concurrency.split(',')]
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'workers': args.workers,
+            'requests_per_level': args.requests,
+            'response_cache': args.with_cache,
+            'paths': PATHS,
+        },
+    }
+    for name, command in _servers(args.workers).items():
+        port = _free_port()
+        server = subprocess.Popen(command(port), env=env, stdout=subprocess.DEVNULL)
+        try:
+            _wait_ready(port)
+            report[name] = {str(level): drive(port, level, args.requests) for level in levels}
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
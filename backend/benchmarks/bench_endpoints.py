@@ -0,0 +1,283 @@
+"""Latency and throughput of every public and admin endpoint.
+
+Seeds a dedicated database from backend/data/*.json, scaled up to the
+requested sizes, then drives each endpoint through the Flask test client and
+through a real threaded WSGI server. Prints (or writes) JSON so runs from two
+commits can be diffed.
+
+Run from backend/:
+    python -m benchmarks.bench_endpoints                        # local mongod
+    python -m benchmarks.bench_endpoints --backend mongomock    # in-memory stand-in
+    python -m benchmarks.bench_endpoints --blogs 10000 --contacts 100000 -o bench.json
+"""
+import argparse
+import copy
+import http.client
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from config import Config, DATA_DIR
+from models import ContactMessage
+
+
+def _load(name):
+    with open(os.path.join(DATA_DIR, f'{name}.json')) as f:
+        return json.load(f)
+
+
+def _scaled(name, size):
+    """Repeat the seed documents until there are `size` of them, with fresh ids."""
+    seed = _load(name)
+    docs = []
+    for i in range(size):
+        doc = copy.deepcopy(seed[i % len(seed)])
+        doc['id'] = i + 1
+        if i >= len(seed):
+            for field in ('title', 'name', 'question'):
+                if field in doc:
+                    doc[field] = f"{doc[field]} #{i + 1}"
+        docs.append(doc)
+    return docs
+
+
+def seed(db, args):
+    now = datetime.utcnow()
+    collections = {
+        'services': _scaled('services', args.services),
+        'projects': _scaled('projects', args.projects),
+        'pricing': _scaled('pricing', 3),
+        'testimonials': _scaled('testimonials', args.testimonials),
+        'clients': _scaled('clients', 10),
+        'faqs': _scaled('faqs', args.faqs),
+        'blogs': _scaled('blogs', args.blogs),
+        # Built like POST /api/contact builds them, so created_at has the same type
+        'contact_messages': [ContactMessage(
+            full_name=f'Visitor {i}',
+            email=f'visitor{i}@example.com',
+            phone='+1 555 0100',
+            message='I would like to know more about your services.',
+            created_at=now - timedelta(minutes=i),
+            read=i % 3 == 0,
+        ).to_dict() for i in range(args.contacts)],
+        'submitted_questions': [{
+            'id': i + 1,
+            'question': f'Question {i + 1}?',
+            'email': '',
+            'created_at': now - timedelta(minutes=i),
+            'answered': i % 2 == 0,
+            'answer': None,
+            'answered_at': None,
+        } for i in range(args.questions)],
+    }
+    for name, docs in collections.items():
+        for start in range(0, len(docs), 10000):
+            db[name].insert_many(docs[start:start + 10000])
+    db['home'].insert_one(_load('home'))
+    db['about'].insert_one(_load('about'))
+
+
+def endpoints(db):
+    blog = db['blogs'].find_one({}, {'_id': 1, 'category': 1})
+    category = db['projects'].find_one({}, {'category': 1})['category']
+    public = [
+        ('GET', '/api/home'),
+        ('GET', '/api/about'),
+        ('GET', '/api/services'),
+        ('GET', '/api/projects'),
+        ('GET', f'/api/projects?category={quote(category)}'),
+        ('GET', '/api/filters'),
+        ('GET', '/api/pricing'),
+        ('GET', '/api/testimonials'),
+        ('GET', '/api/clients'),
+        ('GET', '/api/faqs'),
+        ('GET', '/api/contact/faqs'),
+        ('GET', '/api/blogs'),
+        ('GET', f"/api/blogs?category={quote(blog['category'])}&limit=3&exclude=1"),
+        ('GET', f"/api/blogs/{blog['_id']}"),
+        ('GET', '/api/pages/home'),
+        ('GET', '/api/pages/pricing'),
+        ('GET', '/api/pages/services'),
+        ('GET', '/api/pages/about'),
+        ('POST', '/api/contact', {'full_name': 'Bench', 'email': 'bench@example.com',
+                                  'phone': '1', 'message': 'hello'}),
+        ('POST', '/api/submit-question', {'question': 'Benchmark?'}),
+    ]
+    admin = [
+        ('GET', '/api/admin/verify'),
+        ('GET', '/api/admin/services'),
+        ('GET', '/api/services/admin'),
+        ('GET', '/api/admin/testimonials'),
+        ('GET', '/api/admin/blogs'),
+        ('GET', '/api/admin/projects'),
+        ('GET', '/api/admin/pricing'),
+        ('GET', '/api/admin/about'),
+        ('GET', '/api/admin/home'),
+        ('GET', '/api/admin/clients'),
+        ('GET', '/api/admin/faqs'),
+        ('GET', '/api/admin/contact-messages'),
+        ('GET', '/api/admin/submitted-questions'),
+        ('PUT', '/api/admin/services/1', {'title': 'Bench', 'desc': 'Benchmark service'}),
+    ]
+    return [(e, False) for e in public] + [(e, True) for e in admin]
+
+
+def summarize(latencies, wall):
+    latencies = sorted(latencies)
+    n = len(latencies)
+
+    def pct(p):
+        return round(latencies[min(n - 1, int(p / 100 * n))] * 1000, 3)
+
+    return {
+        'requests': n,
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'p99_ms': pct(99),
+        'rps': round(n / wall, 1) if wall else None,
+    }
+
+
+def run_test_client(app, plan, token, requests):
+    client = app.test_client()
+    results = {}
+    for (method, path, *body), admin in plan:
+        headers = {'Authorization': f'Bearer {token}'} if admin else {}
+        kwargs = {'headers': headers, 'json': body[0] if body else None}
+        for _ in range(min(10, requests)):
+            client.open(path, method=method, **kwargs)
+
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            t = time.perf_counter()
+            client.open(path, method=method, **kwargs)
+            latencies.append(time.perf_counter() - t)
+        results[f'{method} {path}'] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+
+def run_wsgi(app, plan, token, requests, concurrency):
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+    local = threading.local()
+
+    def call(method, path, body, headers):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection('127.0.0.1', port)
+        payload = json.dumps(body) if body is not None else None
+        t = time.perf_counter()
+        conn.request(method, path, body=payload, headers=headers)
+        conn.getresponse().read()
+        return time.perf_counter() - t
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for (method, path, *body), admin in plan:
+                headers = {'Content-Type': 'application/json'}
+                if admin:
+                    headers['Authorization'] = f'Bearer {token}'
+                body = body[0] if body else None
+                list(pool.map(lambda _: call(method, path, body, headers), range(min(10, requests))))
+
+                started = time.perf_counter()
+                latencies = list(pool.map(lambda _: call(method, path, body, headers), range(requests)))
+                results[f'{method} {path}'] = summarize(latencies, time.perf_counter() - started)
+    finally:
+        server.shutdown()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=['mongod', 'mongomock'], default='mongod')
+    parser.add_argument('--db', default='elve_agency_bench',
+                        help='database to (re)create; must contain "bench"')
+    parser.add_argument('--mode', choices=['testclient', 'wsgi', 'both'], default='both')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads in wsgi mode')
+    parser.add_argument('--blogs', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--services', type=int, default=20)
+    parser.add_argument('--testimonials', type=int, default=20)
+    parser.add_argument('--faqs', type=int, default=50)
+    parser.add_argument('--contacts', type=int, default=10000)
+    parser.add_argument('--questions', type=int, default=1000)
+    parser.add_argument('-o', '--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if 'bench' not in args.db:
+        parser.error('--db must contain "bench"; it is dropped before seeding')
+
+    # Point the shared client at the benchmark database before anything connects
+    Config.MONGODB_DBNAME = args.db
+    # Every request comes from one address; measure the routes, not the limiter
+    Config.RATE_LIMIT_ENABLED = False
+    import db as db_module
+    if args.backend == 'mongomock':
+        import mongomock
+        db_module._client = mongomock.MongoClient()
+        db_module._pid = os.getpid()
+
+    database = db_module.get_db()
+    database.client.drop_database(args.db)
+    seed(database, args)
+
+    from app import app
+    from models import ensure_indexes
+    ensure_indexes()
+
+    login = app.test_client().post('/api/admin/login', json={
+        'username': os.getenv('ADMIN_USERNAME', 'admin'),
+        'password': os.getenv('ADMIN_PASSWORD', 'adminpassword'),
+    })
+    token = login.get_json()['token']
+
+    plan = endpoints(database)
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'backend': args.backend,
+            'requests_per_endpoint': args.requests,
+            'concurrency': args.concurrency,
+            'sizes': {name: database[name].estimated_document_count()
+                      for name in ('blogs', 'projects', 'contact_messages', 'submitted_questions')},
+        },
+    }
+    if args.mode in ('testclient', 'both'):
+        report['testclient'] = run_test_client(app, plan, token, args.requests)
+    if args.mode in ('wsgi', 'both'):
+        report['wsgi'] = run_wsgi(app, plan, token, args.requests, args.concurrency)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
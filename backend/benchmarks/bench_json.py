@@ -0,0 +1,80 @@
+"""Serialization throughput: old jsonify path vs MongoJSONProvider.
+
+Run from backend/:
+    python -m benchmarks.bench_json [--docs 1000] [--rounds 50]
+
+"old" reproduces the routes before the provider existed: a Python loop that
+stringifies _id and created_at on every document, then Flask's default
+provider. "new" hands the raw documents to MongoJSONProvider.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import MongoJSONProvider, orjson
+
+
+def make_docs(count):
+    now = datetime.utcnow()
+    return [{
+        '_id': ObjectId(),
+        'id': i,
+        'full_name': f'Visitor {i}',
+        'email': f'visitor{i}@example.com',
+        'phone': '+1 555 0100',
+        'message': 'Hello, I would like to know more about your services. ' * 4,
+        'created_at': now - timedelta(minutes=i),
+        'read': i % 3 == 0,
+    } for i in range(count)]
+
+
+def old_path(provider, docs):
+    docs = [dict(doc) for doc in docs]
+    for doc in docs:
+        doc['_id'] = str(doc['_id'])
+        doc['created_at'] = doc['created_at'].isoformat()
+    return provider.dumps(docs)
+
+
+def new_path(provider, docs):
+    return provider.dumps(iter(docs))
+
+
+def measure(fn, provider, docs, rounds):
+    fn(provider, docs)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(provider, docs)
+    elapsed = time.perf_counter() - started
+    return {
+        'ms_per_call': round(elapsed / rounds * 1000, 3),
+        'docs_per_sec': round(len(docs) * rounds / elapsed),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    docs = make_docs(args.docs)
+    results = {
+        'docs': args.docs,
+        'orjson': orjson is not None,
+        'old': measure(old_path, DefaultJSONProvider(app), docs, args.rounds),
+        'new': measure(new_path, MongoJSONProvider(app), docs, args.rounds),
+    }
+    results['speedup'] = round(results['old']['ms_per_call'] / results['new']['ms_per_call'], 2)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
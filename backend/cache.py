@@ -0,0 +1,221 @@
+import hashlib
+import os
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+import uuid
+from flask import request, make_response, current_app
+from config import Config
+import assets
+import coherence
+import compression
+
+# Serialized JSON bodies of public GET responses, keyed by path + query string.
+# Each entry remembers which collections it was built from so that an admin
+# write only drops the entries it actually affects. cached() serves Flask
+# views; asgi.py uses lookup()/store()/encoded() directly with the same keys.
+_entries = OrderedDict()
+_versions = {}
+_instance = uuid.uuid4().hex[:8]
+_epoch = None   # set while _versions are the shared ones from coherence.py
+_lock = Lock()
+_listeners = []
+
+
+def _source_digest():
+    # The code that serializes the bodies; the same in every worker of a deploy
+    digest = hashlib.sha1()
+    root = os.path.dirname(os.path.abspath(__file__))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ('tests', 'cache', 'static', '__pycache__'))
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+_source = _source_digest()
+_builds = {}   # asset manifest digest -> build id
+
+
+def cache_key(path, args):
+    """Entry key for `path` and its (name, value) query arguments, in any order."""
+    return (path, tuple(sorted(args)))
+
+
+def _snapshot(collections):
+    return tuple(_versions.get(name, 0) for name in collections)
+
+
+def _build():
+    # Bodies also depend on the code and, through fingerprint_urls(), on the
+    # asset manifest. Neither changes with content versions, so a deploy that
+    # changes them must not match ETags handed out before it.
+    manifest = assets.digest()
+    build = _builds.get(manifest)
+    if build is None:
+        build = _builds[manifest] = hashlib.sha1(
+            f'{_source}:{manifest}:{Config.ASSET_FINGERPRINT_URLS}'.encode()).hexdigest()[:8]
+    return build
+
+
+def etag_for(versions):
+    # Shared versions mean the same content on every worker. Until they are
+    # loaded (or while a write couldn't be published) the instance id keeps
+    # one worker's "3" from matching another worker's "3".
+    return '%s-%s-%s' % (_epoch or _instance, _build(), '.'.join(str(v) for v in versions))
+
+
+def etag_matches(if_none_match, etag):
+    """True if the parsed If-None-Match names `etag` in any encoding.
+
+    Each encoding of a body has its own ETag (see below); any of them still
+    names the current version.
+    """
+    return any(if_none_match.contains(tag)
+               for tag in (etag, f'{etag}-gzip', f'{etag}-br'))
+
+
+def lookup(key, collections):
+    """The current versions of `collections` and the entry cached under `key`, if any."""
+    with _lock:
+        versions = _snapshot(collections)
+        entry = _entries.get(key) if Config.RESPONSE_CACHE_ENABLED else None
+        if entry is not None:
+            _entries.move_to_end(key)
+    return versions, entry
+
+
+def store(key, collections, versions, body, mimetype, headers):
+    """Entry for a fresh 200 JSON body built at `versions`, cached under `key`.
+
+    `headers` are the (name, value) pairs replayed with the body.
+    """
+    if Config.ASSET_FINGERPRINT_URLS:
+        body = assets.fingerprint_urls(body)
+    entry = {
+        'body': body,
+        'encoded': {},
+        'mimetype': mimetype,
+        'headers': [(name, value) for name, value in headers if name.startswith('X-')],
+        'collections': collections,
+    }
+    if Config.RESPONSE_CACHE_ENABLED:
+        with _lock:
+            # Don't store a body that was built while a write was landing
+            if _snapshot(collections) == versions:
+                _entries[key] = entry
+                _entries.move_to_end(key)
+                while len(_entries) > Config.RESPONSE_CACHE_SIZE:
+                    _entries.popitem(last=False)
+    return entry
+
+
+def encoded(entry, encoding):
+    """The entry's body compressed with `encoding`; built once, then kept on the entry."""
+    body = entry['encoded'].get(encoding)
+    if body is None:
+        body = compression.compress(entry['body'], encoding, best=True)
+        entry['encoded'][encoding] = body
+    return body
+
+
+def cached(*collections):
+    """Cache the JSON body of a GET view until one of `collections` changes.
+
+    Responses carry a strong ETag built from the collections' content versions,
+    so a matching If-None-Match is answered with 304 before the view runs.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = cache_key(request.path, request.args.items(multi=True))
+            versions, entry = lookup(key, collections)
+
+            etag = etag_for(versions)
+            if etag_matches(request.if_none_match, etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            if entry is not None:
+                response = current_app.response_class(
+                    entry['body'], mimetype=entry['mimetype'], headers=entry['headers'])
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or not response.is_json:
+                    return response
+                entry = store(key, collections, versions, response.get_data(),
+                              response.mimetype, list(response.headers))
+                response.set_data(entry['body'])
+
+            encoding = compression.choose_encoding(entry['mimetype'], len(entry['body']))
+            if encoding:
+                compression.set_encoded_body(response, encoded(entry, encoding), encoding)
+                etag = f'{etag}-{encoding}'
+            else:
+                response.vary.add('Accept-Encoding')
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return decorated
+    return decorator
+
+
+def _drop(collections):
+    stale = [key for key, entry in _entries.items()
+             if any(name in entry['collections'] for name in collections)]
+    for key in stale:
+        del _entries[key]
+
+
+def invalidate(*collections):
+    """Bump the content version of `collections` and drop every cached
+    response built from any of them, here and (through coherence.py) in
+    every other worker."""
+    global _epoch
+    shared = None
+    if coherence.enabled():
+        try:
+            shared = coherence.bump(collections)
+        except Exception as e:
+            # Retried by the next coherence sync; until then ETags are local
+            print(f"❌ Could not publish write to {', '.join(collections)}: {e}")
+    with _lock:
+        if shared is None:
+            _epoch = None
+        for name in collections:
+            _versions[name] = shared[name] if shared else _versions.get(name, 0) + 1
+        _drop(collections)
+    for listener in _listeners:
+        listener(collections)
+
+
+def _apply_shared(changed, baseline):
+    # Writes by other workers, or every version on the first sync
+    global _epoch
+    epoch = coherence.epoch()
+    with _lock:
+        reset = epoch != _epoch
+        for name, version in changed.items():
+            _versions[name] = version if reset else max(_versions.get(name, 0), version)
+        _drop(changed)
+        _epoch = epoch
+
+
+coherence.on_change(_apply_shared)
+
+
+def on_invalidate(listener):
+    """Call `listener(collections)` after every invalidate() in this process."""
+    _listeners.append(listener)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
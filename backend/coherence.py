@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from threading import Lock, Thread
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from config import Config
+from db import get_client
+from models import content_versions_collection
+import metrics
+
+# Cross-worker coherence for in-process state (response cache, search index).
+#
+# Every cache.invalidate() also bumps content_versions, one document per
+# collection: {_id: "<collection>", version, updated_at}. Each worker follows
+# that collection, through a change stream on a replica set or by polling it
+# every CONTENT_VERSIONS_POLL_MS otherwise, and calls the on_change()
+# listeners with the collections another worker has written to.
+#
+# The versions are the same on every worker, so cache.py uses them for ETags.
+# The "_epoch" document is recreated if the collection is ever dropped, so
+# counters that restart from 1 can't match ETags handed out before.
+
+EPOCH_ID = '_epoch'
+
+_listeners = []
+_seen = {}             # collection -> last shared version this worker has applied
+_epoch = None          # None until the first sync (the baseline)
+_unpublished = set()   # bumps that failed; retried on the next sync
+_lock = Lock()
+_started_pid = None
+
+
+def enabled():
+    return Config.CONTENT_VERSIONS_MODE != 'off'
+
+
+def epoch():
+    return _epoch
+
+
+def on_change(listener):
+    """Call `listener(changed, baseline)` when another worker writes.
+
+    `changed` maps collection -> shared version. The first sync of a process
+    (baseline=True) reports every known version rather than new writes.
+    """
+    _listeners.append(listener)
+
+
+def bump(names, retry=False):
+    """Bump the shared version of each collection; returns {name: version}."""
+    versions = {}
+    try:
+        for name in names:
+            doc = content_versions_collection.find_one_and_update(
+                {'_id': name},
+                {'$inc': {'version': 1}, '$set': {'updated_at': datetime.utcnow()}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+            versions[name] = doc['version']
+    except Exception:
+        with _lock:
+            _unpublished.update(names)
+        raise
+    if not retry:
+        with _lock:
+            for name, version in versions.items():
+                # Ours alone only if nobody else bumped it since we last looked
+                if version == _seen.get(name, 0) + 1:
+                    _seen[name] = version
+    return versions
+
+
+def _ensure_epoch():
+    try:
+        content_versions_collection.update_one(
+            {'_id': EPOCH_ID}, {'$setOnInsert': {'epoch': uuid.uuid4().hex[:8]}}, upsert=True)
+    except DuplicateKeyError:
+        pass  # another worker created it first
+    return content_versions_collection.find_one({'_id': EPOCH_ID})['epoch']
+
+
+def sync():
+    """Read content_versions and notify listeners of anything new."""
+    global _epoch
+    if _unpublished:
+        with _lock:
+            pending = set(_unpublished)
+            _unpublished.difference_update(pending)
+        bump(pending, retry=True)  # picked up below like another worker's write
+
+    docs = {doc['_id']: doc for doc in content_versions_collection.find({}, {'version': 1, 'epoch': 1})}
+    current = docs.pop(EPOCH_ID, {}).get('epoch') or _ensure_epoch()
+    remote = {name: doc.get('version', 0) for name, doc in docs.items()}
+
+    with _lock:
+        baseline = _epoch is None
+        if current != _epoch:
+            # First sync, or the counters were reset: every version may differ
+            changed = {name: remote.get(name, 0) for name in set(_seen) | set(remote)}
+            _seen.clear()
+        else:
+            changed = {name: version for name, version in remote.items()
+                       if version > _seen.get(name, 0)}
+        for name, version in changed.items():
+            _seen[name] = max(_seen.get(name, 0), version)
+        _epoch = current
+
+    if not baseline:
+        for name in changed:
+            metrics.inc('content_versions_changes_total', {'collection': name})
+    if changed or baseline:
+        for listener in _listeners:
+            listener(changed, baseline)
+    return changed
+
+
+def _mode():
+    mode = Config.CONTENT_VERSIONS_MODE
+    if mode == 'auto':
+        # Change streams need a replica set (or mongos); standalone servers poll
+        hello = get_client().admin.command('hello')
+        mode = 'stream' if 'setName' in hello or hello.get('msg') == 'isdbgrid' else 'poll'
+    return mode
+
+
+def _stream():
+    interval = Config.CONTENT_VERSIONS_POLL_MS
+    with content_versions_collection.watch(max_await_time_ms=interval) as stream:
+        sync()  # anything written before the stream opened
+        while stream.alive:
+            if stream.try_next() is not None or _unpublished:
+                sync()
+
+
+def _follow(mode):
+    interval = Config.CONTENT_VERSIONS_POLL_MS / 1000
+    while True:
+        try:
+            if mode == 'stream':
+                _stream()
+            else:
+                sync()
+                time.sleep(interval)
+        except OperationFailure as e:
+            if mode == 'stream' and Config.CONTENT_VERSIONS_MODE == 'auto':
+                print(f"❌ content_versions change stream unavailable, polling instead: {e}")
+                mode = 'poll'
+            else:
+                print(f"❌ Could not follow content_versions: {e}")
+                time.sleep(interval)
+        except Exception as e:
+            # MongoDB unreachable: keep serving local state and try again
+            print(f"❌ Could not follow content_versions: {e}")
+            time.sleep(interval)
+
+
+def start():
+    """Load the shared versions and follow them in the background, once per process."""
+    global _started_pid
+    if not enabled() or _started_pid == os.getpid():
+        return None
+    _started_pid = os.getpid()
+    try:
+        mode = _mode()
+    except Exception as e:
+        print(f"❌ Could not detect replica set, polling content_versions: {e}")
+        mode = 'poll'
+    try:
+        sync()
+    except Exception as e:
+        print(f"❌ Could not load content_versions: {e}")
+    Thread(target=_follow, args=(mode,), daemon=True, name='content-versions').start()
+    return mode
+
+
+if __name__ == '__main__':
+    # python coherence.py  -- print writes as this worker would see them
+    on_change(lambda changed, baseline: print(
+        '%s %s' % ('baseline' if baseline else 'changed', changed), flush=True))
+    print(f"Following content_versions ({start()})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,64 @@
+import gzip
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli to enable Content-Encoding: br
+    brotli = None
+
+# Text-like types only; images and other already-compressed formats are skipped
+COMPRESSIBLE = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'image/svg+xml',
+}
+
+
+def choose_encoding(mimetype, size, accepted=None):
+    """Pick the best encoding the client accepts for a body, or None.
+
+    `accepted` defaults to the current Flask request's Accept-Encoding.
+    """
+    if mimetype not in COMPRESSIBLE or size < Config.COMPRESS_MIN_SIZE:
+        return None
+    if accepted is None:
+        accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding, best=False):
+    """Compress `body`. `best` trades CPU for size, for bodies compressed once and reused."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else Config.COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else Config.COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def set_encoded_body(response, body, encoding):
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+
+def compress_response(response):
+    """after_request hook for responses that didn't come from the response cache."""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = choose_encoding(response.mimetype, len(body))
+    if encoding:
+        set_encoded_body(response, compress(body, encoding), encoding)
+    return response
@@ -3,10 +3,110 @@ from dotenv import load_dotenv
 
 load_dotenv()
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data'))
+CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'cache'))
 class Config:
-    #DB configuration
-    MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/elve_agency')
-    MONGODB_DBNAME = os.getenv('MONGODB_DBNAME', 'elve_agency')
+    #DB configuration (MONGO_URI / MONGO_DB_NAME are accepted as older aliases)
+    MONGODB_URI = (os.getenv('MONGODB_URI') or os.getenv('MONGO_URI')
+                   or 'mongodb://localhost:27017/elve_agency')
+    # Empty means: use the database named in the URI, else elve_agency
+    MONGODB_DBNAME = os.getenv('MONGODB_DBNAME') or os.getenv('MONGO_DB_NAME')
+
+    #Connection pool, shared by the whole process
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '60000'))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+    # Per-operation time limit (sent as maxTimeMS); 0 disables it
+    MONGO_TIMEOUT_MS = int(os.getenv('MONGO_TIMEOUT_MS', '10000'))
+    # Wire compression, e.g. "zstd,snappy,zlib" if those packages are installed
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zlib')
+
+    #Admin auth (ADMIN_SECRET is accepted as an older alias of JWT_SECRET)
+    JWT_SECRET = os.getenv('JWT_SECRET') or os.getenv('ADMIN_SECRET') or 'secret_key'
+    JWT_TTL_SECONDS = int(os.getenv('JWT_TTL_SECONDS', str(24 * 3600)))
+    # Static token accepted alongside JWTs; disabled unless set
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    # Verified tokens remembered per worker (until their exp)
+    AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', '1024'))
+
+    #Response cache for public GET endpoints
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', '1') == '1'
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '512'))
+
+    #Threads used to read collections concurrently for /api/pages/<page>
+    PAGE_BUNDLE_WORKERS = int(os.getenv('PAGE_BUNDLE_WORKERS', '8'))
+
+    #Largest page /api/blogs will return
+    BLOGS_MAX_LIMIT = int(os.getenv('BLOGS_MAX_LIMIT', '100'))
+
+    #Resized image variants served from /images/<file>?w=&format=
+    IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', os.path.join(CACHE_DIR, 'images'))
+    IMAGE_WIDTHS = [int(w) for w in os.getenv('IMAGE_WIDTHS', '64,128,256,480,768,1024,1600').split(',')]
+    IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '80'))
+    IMAGE_VARIANT_MAX_AGE = int(os.getenv('IMAGE_VARIANT_MAX_AGE', str(30 * 24 * 3600)))
+
+    #Fingerprinted static URLs (/images/<name>.<hash>.<ext>) are cached forever
+    ASSET_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+    # Rewrite /images/... paths in public API responses to fingerprinted URLs
+    ASSET_FINGERPRINT_URLS = os.getenv('ASSET_FINGERPRINT_URLS', '1') == '1'
+
+    #Response compression (brotli is used when the `brotli` package is installed)
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '5'))
+
+    #Neighbours stored per blog/project by related.py
+    RELATED_TOP_K = int(os.getenv('RELATED_TOP_K', '6'))
+    #Writes to one collection within this window share one related.py update
+    RELATED_DEBOUNCE_MS = int(os.getenv('RELATED_DEBOUNCE_MS', '200'))
+
+    #Admin contact inbox page size (?limit=) and the largest allowed
+    INBOX_PAGE_SIZE = int(os.getenv('INBOX_PAGE_SIZE', '50'))
+    INBOX_MAX_LIMIT = int(os.getenv('INBOX_MAX_LIMIT', '200'))
+
+    #Contact form / question submissions are queued and written in batches
+    INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '10000'))
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '100'))
+    INGEST_FLUSH_INTERVAL_MS = int(os.getenv('INGEST_FLUSH_INTERVAL_MS', '200'))
+    # Seconds clients are asked to wait (Retry-After) when the queue is full
+    INGEST_RETRY_AFTER = int(os.getenv('INGEST_RETRY_AFTER', '5'))
+    # Batches that can't reach MongoDB are appended here and replayed later
+    INGEST_SPILL_DIR = os.getenv('INGEST_SPILL_DIR', os.path.join(CACHE_DIR, 'ingest'))
+
+    #Rate limits on public write routes (policies are declared on the routes)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+    # e.g. redis://localhost:6379/0 to share buckets between workers (needs `redis`)
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL', '')
+    # Number of reverse proxies whose X-Forwarded-For entry is trusted
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+    # Per-IP buckets kept in memory before the least recent are dropped
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+
+    #Admin writes bump content_versions so every worker drops stale local state:
+    # "auto" (change stream on a replica set, else polling), "stream", "poll" or "off"
+    CONTENT_VERSIONS_MODE = os.getenv('CONTENT_VERSIONS_MODE', 'auto')
+    # Poll interval, and the longest a change stream waits before checking in
+    CONTENT_VERSIONS_POLL_MS = int(os.getenv('CONTENT_VERSIONS_POLL_MS', '1000'))
+
+    #Documents per chunk / bulk_write batch for the NDJSON export and import
+    TRANSFER_BATCH_SIZE = int(os.getenv('TRANSFER_BATCH_SIZE', '1000'))
+
+    #Static JSON snapshot of the public API for nginx (see snapshot.py)
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(CACHE_DIR, 'snapshot'))
+    # Re-render the affected files after every admin write
+    SNAPSHOT_ON_WRITE = os.getenv('SNAPSHOT_ON_WRITE', '0') == '1'
+    SNAPSHOT_DEBOUNCE_MS = int(os.getenv('SNAPSHOT_DEBOUNCE_MS', '500'))
+    # Versions kept on disk, including the current one
+    SNAPSHOT_KEEP = int(os.getenv('SNAPSHOT_KEEP', '3'))
+
+    #Slow-query log: commands slower than this are recorded with their plan (0 disables)
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '100'))
+    # "mongo" (capped collection) or "file" (rotating JSON lines)
+    SLOW_QUERY_STORE = os.getenv('SLOW_QUERY_STORE', 'mongo')
+    SLOW_QUERY_COLLECTION = os.getenv('SLOW_QUERY_COLLECTION', 'slow_queries')
+    SLOW_QUERY_CAPPED_BYTES = int(os.getenv('SLOW_QUERY_CAPPED_BYTES', str(16 * 1024 * 1024)))
+    SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', os.path.join(CACHE_DIR, 'slow_queries.log'))
 
     #Paths to data files
     HOME_DATA = os.path.join(DATA_DIR, 'home.json')
@@ -0,0 +1,96 @@
+import copy
+import json
+import os
+from config import Config
+from models import home_collection, about_collection, services_collection, pricing_collection
+from cache import invalidate
+from sequences import allocate_id, sync_counter
+import search
+
+# Reads shared by the single-collection endpoints and the page bundles, so
+# both return the same thing on a fresh database: home, services and pricing
+# are seeded from backend/data on first read, and about falls back to
+# ABOUT_DEFAULT until an admin saves one.
+
+ABOUT_DEFAULT = {
+    'learnContainer': {
+        'heading': 'Learn More\nAbout Us',
+        'videoImage': '/images/Frame (4).png'
+    },
+    'storySection': {
+        'mainHeading': 'The story of who we are\nand the vision that drives\nus forward',
+        'paragraphs': [
+            'Default paragraph 1',
+            'Default paragraph 2'
+        ],
+        'images': [
+            '/images/default1.png',
+            '/images/default2.png'
+        ]
+    },
+    'coreValues': [],
+    'team': [],
+    'awards': []
+}
+
+
+def _seed(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_home():
+    """The home document, seeded from HOME_DATA if empty; None if there is none."""
+    home_data = home_collection.find_one({}, {'_id': 0})
+    if home_data:
+        return home_data
+
+    home_data = _seed(Config.HOME_DATA)
+    if not home_data:
+        return None
+    home_collection.insert_one(home_data)
+    # Responses cached while the collection was empty are stale now
+    invalidate('home')
+    home_data.pop('_id', None)
+    return home_data
+
+
+def load_about(projection=None):
+    """The about document, or ABOUT_DEFAULT (without FAQs) if none was saved."""
+    return about_collection.find_one({}, projection) or copy.deepcopy(ABOUT_DEFAULT)
+
+
+def load_services():
+    """Every service, seeded from SERVICES_DATA if empty."""
+    services = list(services_collection.find({}, {'_id': 0}))
+    if services:
+        return services
+
+    services = _seed(Config.SERVICES_DATA)
+    if not services:
+        return []
+    # Add IDs to services from JSON
+    first_id = allocate_id(services_collection, len(services))
+    for i, service in enumerate(services):
+        service['id'] = first_id + i
+    services_collection.insert_many(services)
+    invalidate('services')
+    search.refresh('services')
+    return list(services_collection.find({}, {'_id': 0}))
+
+
+def load_pricing():
+    """Every pricing plan, seeded from PRICING_DATA if empty."""
+    pricing_data = list(pricing_collection.find({}, {'_id': 0}))
+    if pricing_data:
+        return pricing_data
+
+    pricing_data = _seed(Config.PRICING_DATA)
+    if not pricing_data:
+        return []
+    pricing_collection.insert_many(pricing_data)
+    sync_counter(pricing_collection)
+    invalidate('pricing')
+    return list(pricing_collection.find({}, {'_id': 0}))
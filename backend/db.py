@@ -1,27 +1,91 @@
 from pymongo import MongoClient
+from threading import Lock
 import os
-from dotenv import load_dotenv
-from flask import jsonify
+from config import Config
 
-load_dotenv()
+# One MongoClient (and so one connection pool) per process. Every blueprint
+# goes through get_db() or a LazyCollection handle instead of opening its own.
 
-MONGO_URI = os.getenv("MONGO_URI")
+if "cluster0.abc.mongodb.net" in Config.MONGODB_URI:
+    raise RuntimeError("❌ Replace placeholder Mongo URI with your real cluster URI")
 
-if not MONGO_URI:
-    raise EnvironmentError("❌ MONGO_URI not found in .env file!")
+if Config.MONGODB_URI.startswith("mongodb+srv://"):
+    try:
+        import dns  # type: ignore
+    except Exception:
+        raise RuntimeError("❌ Install SRV support: pip install 'pymongo[srv]'")
 
 _client = None
-_db = None
+_pid = None
+_lock = Lock()
+_async_client = None
+_async_pid = None
+
+
+def client_options():
+    options = {
+        "appname": "elve_agency_backend",
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    }
+    # timeoutMS bounds every operation and is sent to the server as maxTimeMS
+    if Config.MONGO_TIMEOUT_MS:
+        options["timeoutMS"] = Config.MONGO_TIMEOUT_MS
+    if Config.MONGO_COMPRESSORS:
+        options["compressors"] = Config.MONGO_COMPRESSORS
+    return options
+
+
+def get_client():
+    """Return this process's MongoClient, creating it on first use.
+
+    A client inherited across fork() is never reused: the child builds its own
+    so gunicorn workers don't share the parent's sockets or monitor threads.
+    """
+    global _client, _pid
+    if _client is None or _pid != os.getpid():
+        with _lock:
+            if _client is None or _pid != os.getpid():
+                _client = MongoClient(Config.MONGODB_URI, **client_options())
+                _pid = os.getpid()
+    return _client
+
 
 def get_db():
-    global _client, _db
-    if _db is None:
-        try:
-            _client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5001, appName="elve_agency_backend")
-            _client.admin.command('ping')
-            print("✅----------- Connected to MongoDB Atlas (Admin-only)")
-            _db = _client.elve_agency  
-        except Exception as e:
-            print("❌ ----------- DB Connection failed:", str(e))
-            raise ConnectionError(f"Could not connect to MongoDB: {e}")
-    return _db
\ No newline at end of file
+    client = get_client()
+    if Config.MONGODB_DBNAME:
+        return client[Config.MONGODB_DBNAME]
+    return client.get_default_database("elve_agency")
+
+
+def get_async_db():
+    """Database handle on this process's AsyncMongoClient (asgi.py only).
+
+    Same URI, pool settings and database as get_db(). Must be first called
+    from inside the event loop that serves requests.
+    """
+    global _async_client, _async_pid
+    if _async_client is None or _async_pid != os.getpid():
+        from pymongo import AsyncMongoClient
+        _async_client = AsyncMongoClient(Config.MONGODB_URI, **client_options())
+        _async_pid = os.getpid()
+    if Config.MONGODB_DBNAME:
+        return _async_client[Config.MONGODB_DBNAME]
+    return _async_client.get_default_database("elve_agency")
+
+
+class LazyCollection:
+    """Module-level collection handle that resolves through get_db() on use,
+    so it is safe to create at import time and to keep across fork()."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(get_db()[self.name], attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
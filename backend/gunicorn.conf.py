@@ -0,0 +1,14 @@
+# gunicorn reads this file automatically when started from backend/:
+#   gunicorn -w 4 -b 0.0.0.0:5001 app:app
+
+def post_fork(server, worker):
+    # Each worker opens its own MongoDB connection as soon as it starts,
+    # in the background, instead of on its first request.
+    from app import app, warm_up
+    warm_up(app)
+
+
+def worker_exit(server, worker):
+    # Write queued contact messages and questions before the worker goes away
+    import ingest
+    ingest.shutdown()
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import tempfile
+from threading import Lock
+from config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it originals are served
+    Image = None
+
+# Resized / re-encoded copies of static/images, generated on first request
+# and kept on disk as <cache dir>/<source hash>-<width>.<format>.
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'jpg': ('JPEG', 'image/jpeg'),
+    'png': ('PNG', 'image/png'),
+}
+
+_hashes = {}
+_hash_lock = Lock()
+
+
+def variants_available():
+    return Image is not None
+
+
+def has_variants(path):
+    """Only sources in one of FORMATS are resized; others (.gif, .svg, ...) are served as is."""
+    return os.path.splitext(path)[1].lstrip('.').lower() in FORMATS
+
+
+def snap_width(width):
+    """Round a requested width up to the nearest configured size, so arbitrary
+    ?w= values can't fill the cache with one-off variants."""
+    for allowed in Config.IMAGE_WIDTHS:
+        if width <= allowed:
+            return allowed
+    return Config.IMAGE_WIDTHS[-1]
+
+
+def _source_hash(path):
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        cached = _hashes.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    source_hash = digest.hexdigest()[:16]
+    with _hash_lock:
+        _hashes[path] = (stamp, source_hash)
+    return source_hash
+
+
+def get_variant(source_path, width=None, fmt=None, source_hash=None):
+    """Return (path, mimetype) of the variant, creating it if needed."""
+    ext = os.path.splitext(source_path)[1].lstrip('.').lower()
+    fmt = (fmt or ext).lower()
+    pil_format, mimetype = FORMATS[fmt]
+    width = snap_width(width) if width else 0
+
+    source_hash = source_hash or _source_hash(source_path)
+    name = f"{source_hash}-{width}-q{Config.IMAGE_QUALITY}.{fmt}"
+    variant_path = os.path.join(Config.IMAGE_CACHE_DIR, name)
+    if os.path.exists(variant_path):
+        return variant_path, mimetype
+
+    os.makedirs(Config.IMAGE_CACHE_DIR, exist_ok=True)
+    with Image.open(source_path) as img:
+        if width and img.width > width:
+            height = round(img.height * width / img.width)
+            img = img.resize((width, height), Image.LANCZOS)
+        if pil_format == 'JPEG' and img.mode != 'RGB':
+            img = img.convert('RGB')
+        elif img.mode == 'P':
+            img = img.convert('RGBA')
+
+        # Write to a temp file and rename so readers never see a partial image
+        fd, tmp_path = tempfile.mkstemp(dir=Config.IMAGE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                img.save(out, pil_format, quality=Config.IMAGE_QUALITY, optimize=True)
+            os.replace(tmp_path, variant_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    return variant_path, mimetype
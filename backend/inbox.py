@@ -0,0 +1,91 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from models import contact_messages_collection, counters_collection
+import ingest
+
+# Admin contact inbox: newest-first pages keyed on _id, and an unread counter
+# kept in counters as {_id: "contact_messages.unread", count}. ObjectIds grow
+# with insertion time and always compare the same way, unlike created_at,
+# which older messages store as a datetime or not at all.
+# Every path that inserts, marks or deletes messages adjusts the counter, so
+# the admin badge is a single find_one rather than a scan of the inbox.
+
+UNREAD_ID = 'contact_messages.unread'
+UNREAD = {'read': {'$ne': True}}
+STATUS_FILTERS = {'all': {}, 'unread': UNREAD, 'read': {'read': True}}
+SORT = [('_id', -1)]
+
+
+def _unread(doc):
+    return doc.get('read') is not True
+
+
+def encode_cursor(doc):
+    return str(doc['_id'])
+
+
+def decode_cursor(cursor):
+    """Filter for the messages after `cursor`. Raises ValueError if malformed."""
+    try:
+        return {'_id': {'$lt': ObjectId(cursor)}}
+    except (InvalidId, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def page(status='all', cursor=None, limit=50):
+    """One page of messages, newest first, and the cursor of the next page."""
+    query = dict(STATUS_FILTERS[status])
+    if cursor:
+        query.update(decode_cursor(cursor))
+    messages = list(contact_messages_collection.find(query).sort(SORT).limit(limit))
+    next_cursor = encode_cursor(messages[-1]) if len(messages) == limit else None
+    return messages, next_cursor
+
+
+def recount():
+    """Reset the unread counter from the messages themselves."""
+    count = contact_messages_collection.count_documents(UNREAD)
+    counters_collection.update_one({'_id': UNREAD_ID}, {'$set': {'count': count}}, upsert=True)
+    return count
+
+
+def unread_count():
+    counter = counters_collection.find_one({'_id': UNREAD_ID})
+    return counter['count'] if counter else recount()
+
+
+def adjust(delta):
+    # No upsert: until the first recount() there is nothing to adjust
+    if delta:
+        counters_collection.update_one({'_id': UNREAD_ID}, {'$inc': {'count': delta}})
+
+
+def update(message_id, data):
+    """Apply `data` to one message; returns False if it doesn't exist."""
+    before = contact_messages_collection.find_one_and_update(
+        {'_id': ObjectId(message_id)}, {'$set': data}, projection={'read': 1})
+    if before is None:
+        return False
+    if 'read' in data:
+        adjust(_unread(data) - _unread(before))
+    return True
+
+
+def delete(message_id):
+    """Delete one message; returns False if it doesn't exist."""
+    before = contact_messages_collection.find_one_and_delete(
+        {'_id': ObjectId(message_id)}, projection={'read': 1})
+    if before is None:
+        return False
+    adjust(-_unread(before))
+    return True
+
+
+def mark_all_read():
+    result = contact_messages_collection.update_many(UNREAD, {'$set': {'read': True}})
+    adjust(-result.modified_count)
+    return result.modified_count
+
+
+# New submissions are written in batches by ingest.py, all unread
+ingest.on_insert('contact_messages', adjust)
@@ -0,0 +1,241 @@
+import atexit
+import glob
+import os
+import queue
+import time
+from threading import Thread, Lock
+from bson import ObjectId, json_util
+from flask import jsonify
+from pymongo.errors import BulkWriteError
+from config import Config
+from db import get_db
+from sequences import allocate_id
+import metrics
+
+# Visitor submissions (contact form, questions) are validated on the request
+# thread, queued in memory and written by a background thread with one
+# insert_many per batch. If MongoDB is unreachable the batch is appended to a
+# local spill file instead and replayed at the next warm-up, or as soon as a
+# later batch goes through.
+#
+# Documents get their ObjectId when queued, so a replayed batch that was
+# partly written before simply hits duplicate keys.
+
+# Collections whose documents get an integer `id` when their batch is written
+NUMBERED = {'submitted_questions'}
+
+BATCH_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+
+class QueueFull(Exception):
+    """The ingestion queue is at INGEST_QUEUE_SIZE; ask the client to retry."""
+
+
+_queue = None
+_thread = None
+_pid = None
+_lock = Lock()
+_spill_lock = Lock()
+_spilled = False
+_on_insert = {}
+
+
+def _ensure_started():
+    global _queue, _thread, _pid
+    if _pid == os.getpid():
+        return
+    with _lock:
+        if _pid == os.getpid():
+            return
+        # Queues and threads don't survive fork; each worker gets its own
+        _queue = queue.Queue(maxsize=Config.INGEST_QUEUE_SIZE)
+        _thread = Thread(target=_run, daemon=True, name='ingest')
+        _thread.start()
+        _pid = os.getpid()
+        atexit.register(shutdown)
+
+
+def submit(collection, doc):
+    """Queue `doc` for insertion into `collection` and return its _id.
+
+    Raises QueueFull when the queue is full.
+    """
+    _ensure_started()
+    doc.setdefault('_id', ObjectId())
+    try:
+        _queue.put_nowait((collection.name, doc))
+    except queue.Full:
+        metrics.inc('ingest_rejected_total', {'collection': collection.name})
+        raise QueueFull()
+    metrics.inc('ingest_enqueued_total', {'collection': collection.name})
+    return doc['_id']
+
+
+def on_insert(name, listener):
+    """Call `listener(count)` after each batch written to collection `name`."""
+    _on_insert.setdefault(name, []).append(listener)
+
+
+def busy(body):
+    """503 response for a full queue."""
+    return jsonify(body), 503, {'Retry-After': str(Config.INGEST_RETRY_AFTER)}
+
+
+def _run():
+    stopping = False
+    while not stopping:
+        item = _queue.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = time.monotonic() + Config.INGEST_FLUSH_INTERVAL_MS / 1000
+        while len(batch) < Config.INGEST_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        _flush(batch)
+
+    # Stop requested: write whatever is left
+    remaining = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not None:
+            remaining.append(item)
+    if remaining:
+        _flush(remaining)
+
+
+def _insert(name, docs):
+    collection = get_db()[name]
+    if name in NUMBERED:
+        missing = [doc for doc in docs if doc.get('id') is None]
+        if missing:
+            first = allocate_id(collection, len(missing))
+            for offset, doc in enumerate(missing):
+                doc['id'] = first + offset
+    try:
+        inserted = len(collection.insert_many(docs, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        # Duplicate _ids are documents a previous attempt already wrote
+        if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+            raise
+        inserted = e.details.get('nInserted', 0)
+    for listener in _on_insert.get(name, ()):
+        listener(inserted)
+
+
+def _flush(batch):
+    global _spilled
+    by_collection = {}
+    for name, doc in batch:
+        by_collection.setdefault(name, []).append(doc)
+
+    ok = True
+    for name, docs in by_collection.items():
+        metrics.observe('ingest_batch_size', {'collection': name}, len(docs), BATCH_BUCKETS)
+        try:
+            _insert(name, docs)
+            metrics.inc('ingest_flushed_total', {'collection': name}, len(docs))
+        except Exception as e:
+            ok = False
+            print(f"❌ Could not write {len(docs)} {name} documents, spilling to disk: {e}")
+            _spill(name, docs)
+
+    if ok and _spilled:
+        _spilled = False
+        replay()
+
+
+def _spill_path():
+    return os.path.join(Config.INGEST_SPILL_DIR, f'spill-{os.getpid()}.ndjson')
+
+
+def _spill(name, docs):
+    global _spilled
+    with _spill_lock:
+        os.makedirs(Config.INGEST_SPILL_DIR, exist_ok=True)
+        with open(_spill_path(), 'a') as f:
+            for doc in docs:
+                f.write(json_util.dumps({'collection': name, 'doc': doc}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        _spilled = True
+    metrics.inc('ingest_spilled_total', {'collection': name}, len(docs))
+
+
+def _abandoned(path):
+    # spill-replay-<pid>-<ns>.ndjson.replaying left behind by a worker that died
+    try:
+        os.kill(int(os.path.basename(path).split('-')[2]), 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
+
+def replay():
+    """Write every spill file (from any worker) to MongoDB.
+
+    A file is claimed by renaming it first, so concurrent workers never
+    replay the same one. Files that still fail are put back for next time.
+    """
+    paths = glob.glob(os.path.join(Config.INGEST_SPILL_DIR, 'spill-*.ndjson'))
+    paths += [path for path in glob.glob(os.path.join(Config.INGEST_SPILL_DIR, '*.replaying'))
+              if _abandoned(path)]
+    for path in paths:
+        claimed = os.path.join(Config.INGEST_SPILL_DIR,
+                               f'spill-replay-{os.getpid()}-{time.time_ns()}.ndjson.replaying')
+        with _spill_lock:
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # another worker got it
+
+        try:
+            by_collection = {}
+            with open(claimed) as f:
+                for line in f:
+                    if line.strip():
+                        record = json_util.loads(line)
+                        by_collection.setdefault(record['collection'], []).append(record['doc'])
+            for name, docs in by_collection.items():
+                _insert(name, docs)
+                metrics.inc('ingest_replayed_total', {'collection': name}, len(docs))
+            os.remove(claimed)
+        except Exception as e:
+            print(f"❌ Spill replay failed, keeping {os.path.basename(path)}: {e}")
+            os.rename(claimed, claimed[:-len('.replaying')].replace('spill-replay-', 'spill-retry-'))
+            return
+
+
+def shutdown(timeout=5):
+    """Flush what is queued; called when a worker exits."""
+    if _pid != os.getpid() or _thread is None:
+        return
+    try:
+        _queue.put(None, timeout=timeout)
+    except queue.Full:
+        pass
+    _thread.join(timeout)
+
+
+metrics.HELP_EXTRA.update({
+    'ingest_enqueued_total': ('counter', 'Submissions accepted into the ingestion queue'),
+    'ingest_rejected_total': ('counter', 'Submissions rejected with 503 because the queue was full'),
+    'ingest_flushed_total': ('counter', 'Queued submissions written to MongoDB'),
+    'ingest_spilled_total': ('counter', 'Submissions written to the local spill file'),
+    'ingest_replayed_total': ('counter', 'Spilled submissions replayed into MongoDB'),
+    'ingest_batch_size': ('histogram', 'Documents per insert_many batch'),
+})
@@ -0,0 +1,55 @@
+import base64
+from collections.abc import Iterator
+from datetime import datetime, date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+from bson import ObjectId, Decimal128, Binary
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder with the same type support
+    orjson = None
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes Mongo documents as they come out of pymongo.
+
+    ObjectId becomes its hex string, datetimes ISO 8601 strings and cursors
+    lists, so routes can jsonify() query results without per-document loops.
+    Uses orjson when it is installed.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, ObjectId):
+            return str(o)
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        if isinstance(o, Decimal128):
+            return str(o.to_decimal())
+        if isinstance(o, Decimal):
+            return str(o)
+        if isinstance(o, (Binary, bytes)):
+            return base64.b64encode(o).decode('ascii')
+        # Cursors, generators and sets
+        if isinstance(o, (Iterator, set, tuple)):
+            return list(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if isinstance(obj, Iterator):
+            obj = list(obj)
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -0,0 +1,49 @@
+"""Create or inspect the indexes declared in models.INDEXES.
+
+    python manage_indexes.py ensure   # create missing indexes
+    python manage_indexes.py report   # missing, extra and unused indexes
+"""
+import sys
+from db import get_db
+from models import INDEXES, ensure_indexes
+
+
+def index_report():
+    report = {}
+    for name, indexes in INDEXES.items():
+        collection = get_db()[name]
+        declared = {index.document['name'] for index in indexes}
+        existing = set(collection.index_information())
+        usage = {stat['name']: stat['accesses']['ops']
+                 for stat in collection.aggregate([{'$indexStats': {}}])}
+        report[name] = {
+            'missing': sorted(declared - existing),
+            'undeclared': sorted(existing - declared - {'_id_'}),
+            # $indexStats counters reset when mongod restarts
+            'unused': sorted(index for index, ops in usage.items()
+                             if ops == 0 and index != '_id_'),
+            'accesses': usage,
+        }
+    return report
+
+
+def print_report(report):
+    for name, info in report.items():
+        print(f"{name}:")
+        for index, ops in sorted(info['accesses'].items()):
+            print(f"    {index:<24} {ops} ops")
+        for key in ('missing', 'undeclared', 'unused'):
+            if info[key]:
+                print(f"    {key}: {', '.join(info[key])}")
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'report'
+    if command == 'ensure':
+        ensure_indexes()
+        print("✅ Indexes created")
+    elif command == 'report':
+        print_report(index_report())
+    else:
+        print(__doc__)
+        sys.exit(1)
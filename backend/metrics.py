@@ -0,0 +1,174 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from flask import g, request, Response
+from pymongo import monitoring
+
+# Per-process request and MongoDB command metrics, exposed at /metrics in the
+# Prometheus text format. With several gunicorn workers each one reports its
+# own numbers; scrape them individually or aggregate by instance.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Endpoint of the request being served; Mongo commands are attributed to it.
+# Work started outside a request (warm-up, background flushes) is "background".
+current_endpoint = ContextVar('current_endpoint', default='background')
+
+_lock = Lock()
+_histograms = {}
+_counters = {}
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def observe(name, labels, value, buckets):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram(buckets)
+        histogram.observe(value)
+
+
+def inc(name, labels, value=1):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+# -------------------------------
+# REQUEST METRICS
+# -------------------------------
+def _before_request():
+    g.metrics_started = perf_counter()
+    g.metrics_token = current_endpoint.set(request.endpoint or 'unmatched')
+
+
+def _after_request(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    labels = {'endpoint': request.endpoint or 'unmatched'}
+    observe('http_request_duration_seconds', labels, perf_counter() - started, LATENCY_BUCKETS)
+    if response.content_length is not None:
+        observe('http_response_size_bytes', labels, response.content_length, SIZE_BUCKETS)
+    inc('http_requests_total', {**labels, 'method': request.method,
+                                'status': str(response.status_code)})
+    return response
+
+
+def _teardown_request(exc):
+    token = g.pop('metrics_token', None)
+    if token is not None:
+        current_endpoint.reset(token)
+
+
+# -------------------------------
+# MONGO COMMAND METRICS
+# -------------------------------
+class CommandMetrics(monitoring.CommandListener):
+    """Counts Mongo round trips and their time per endpoint and command."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        labels = {'endpoint': current_endpoint.get(), 'command': event.command_name}
+        inc('mongo_commands_total', labels)
+        inc('mongo_command_seconds_total', labels, event.duration_micros / 1e6)
+
+    def failed(self, event):
+        labels = {'endpoint': current_endpoint.get(), 'command': event.command_name}
+        inc('mongo_commands_total', labels)
+        inc('mongo_command_failures_total', labels)
+        inc('mongo_command_seconds_total', labels, event.duration_micros / 1e6)
+
+
+# -------------------------------
+# EXPOSITION
+# -------------------------------
+HELP = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint'),
+    'http_response_size_bytes': ('histogram', 'Response body size by endpoint'),
+    'http_requests_total': ('counter', 'Requests by endpoint, method and status'),
+    'mongo_commands_total': ('counter', 'MongoDB commands by originating endpoint'),
+    'mongo_command_failures_total': ('counter', 'Failed MongoDB commands by originating endpoint'),
+    'mongo_command_seconds_total': ('counter', 'Time spent in MongoDB commands by originating endpoint'),
+}
+
+# Other modules (rate limiting, ingestion, ...) can add their own metrics here
+HELP_EXTRA = {}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def render():
+    with _lock:
+        histograms = {key: (list(h.counts), h.sum, h.count, h.buckets)
+                      for key, h in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    described = set()
+
+    def describe(name, default_type):
+        if name in described:
+            return
+        described.add(name)
+        kind, text = HELP.get(name) or HELP_EXTRA.get(name) or (default_type, name)
+        lines.append(f'# HELP {name} {text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    for (name, labels), (counts, total, count, buckets) in sorted(histograms.items()):
+        describe(name, 'histogram')
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+        lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+    for (name, labels), value in sorted(counters.items()):
+        describe(name, 'counter')
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view():
+    return Response(render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_app(app):
+    """Register the request hooks and /metrics. Call before other after_request
+    hooks so the recorded size is the final (compressed) one."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+
+command_metrics = CommandMetrics()
+monitoring.register(command_metrics)
@@ -1,62 +1,90 @@
 from dataclasses import dataclass, asdict, field
 from typing import List, Dict, Optional
 from datetime import datetime
-import os
-from pymongo import MongoClient
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 from dotenv import load_dotenv, find_dotenv
-from pymongo.errors import ConfigurationError, ServerSelectionTimeoutError
+from pymongo.errors import OperationFailure
+from db import get_db, LazyCollection
 
 load_dotenv(find_dotenv())
 
-mongo_uri = (
-    os.getenv("MONGODB_URI")
-    or os.getenv("MONGO_URI")
-    or "mongodb://localhost:27017/elve_agency"
-)
-
-DEFAULT_DB_NAME = os.getenv("MONGO_DB_NAME", "elve_agency")
-
-if "cluster0.abc.mongodb.net" in mongo_uri:
-    raise RuntimeError("❌ Replace placeholder Mongo URI with your real cluster URI")
-
-if mongo_uri.startswith("mongodb+srv://"):
-    try:
-        import dns  # type: ignore
-    except Exception:
-        raise RuntimeError("❌ Install SRV support: pip install 'pymongo[srv]'")
-
-# Client
-client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/elve_agency'))
-db = client.get_database(os.getenv('MONGODB_DBNAME', 'elve_agency'))
-
-try:
-    client.admin.command("ping")
-    print("✅ Connected to MongoDB!......")
-except (ConfigurationError, ServerSelectionTimeoutError) as e:
-    raise RuntimeError(f"❌ MongoDB connection failed: {e}") from e
-
-# Database
-try:
-    db = client.get_database()
-    if not db.name:
-        raise ValueError("No default DB in URI")
-except Exception:
-    db = client[DEFAULT_DB_NAME]
-
 # Collections
-home_collection = db['home']
-projects_collection = db['projects']
-services_collection = db['services']
-pricing_collection = db["pricing"]
-testimonials_collection = db["testimonials"]
-clients_collection = db["clients"]
-faqs_collection = db["faqs"]
-about_collection = db["about"]
-blogs_collection = db["blogs"]
-contact_messages_collection = db["contact_messages"]
+home_collection = LazyCollection('home')
+projects_collection = LazyCollection('projects')
+services_collection = LazyCollection('services')
+pricing_collection = LazyCollection("pricing")
+testimonials_collection = LazyCollection("testimonials")
+clients_collection = LazyCollection("clients")
+faqs_collection = LazyCollection("faqs")
+about_collection = LazyCollection("about")
+blogs_collection = LazyCollection("blogs")
+contact_messages_collection = LazyCollection("contact_messages")
 # Add collection for submitted questions
-submitted_questions_collection = db["submitted_questions"]
+submitted_questions_collection = LazyCollection("submitted_questions")
+# One document per collection holding the last integer id handed out
+counters_collection = LazyCollection("counters")
+# Precomputed related blogs/projects, one document per item (see related.py)
+related_collection = LazyCollection("related_content")
+# Shared version per collection, bumped by every admin write (see coherence.py)
+content_versions_collection = LazyCollection("content_versions")
+# Digests of revoked admin tokens, dropped by a TTL index once they expire
+revoked_tokens_collection = LazyCollection("revoked_tokens")
+
+# Indexes
+def _unique_id():
+    # Older documents may predate integer ids, so only documents that have
+    # one take part in the uniqueness check.
+    return IndexModel(
+        [("id", ASCENDING)],
+        name="id_unique",
+        unique=True,
+        partialFilterExpression={"id": {"$exists": True}},
+    )
+
+INDEXES = {
+    "services": [_unique_id()],
+    "projects": [
+        _unique_id(),
+        IndexModel([("category", ASCENDING)], name="category"),
+    ],
+    "pricing": [_unique_id()],
+    "testimonials": [_unique_id()],
+    "clients": [_unique_id()],
+    "faqs": [_unique_id()],
+    "blogs": [
+        _unique_id(),
+        # Blog listing filters by category and pages on _id (creation time);
+        # `date` is a dd/mm/yyyy display string and can't be range-scanned.
+        IndexModel([("category", ASCENDING), ("_id", ASCENDING)], name="category_id"),
+    ],
+    "contact_messages": [
+        # Admin inbox pages newest first on _id (the default index), optionally
+        # by read status
+        IndexModel([("read", ASCENDING), ("_id", DESCENDING)], name="read_id"),
+    ],
+    "submitted_questions": [
+        _unique_id(),
+        IndexModel([("answered", ASCENDING), ("created_at", ASCENDING)], name="answered_created_at"),
+    ],
+    "revoked_tokens": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "related_content": [
+        # Lookups by numeric id; lookups by ObjectId use the row's _id
+        IndexModel([("collection", ASCENDING), ("id", ASCENDING)], name="collection_id"),
+        IndexModel([("collection", ASCENDING), ("item", ASCENDING)], name="collection_item"),
+    ],
+}
+
+def ensure_indexes():
+    """Create every index in INDEXES. Safe to run on every boot."""
+    for name, indexes in INDEXES.items():
+        try:
+            get_db()[name].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate ids already stored; keep booting and report it
+            print(f"❌ Could not create indexes on {name}: {e}")
 
 # Data Models
 
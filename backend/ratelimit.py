@@ -0,0 +1,150 @@
+import math
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from flask import request, jsonify
+from config import Config
+import metrics
+
+try:
+    import redis
+except ImportError:  # shared buckets need `pip install redis`; in-process otherwise
+    redis = None
+
+# Token buckets for the public write endpoints. Each route declares its policy
+# next to its definition:
+#
+#     @rate_limit(per_ip='5/minute', total='50/second')
+#
+# "N/period" means a bucket of N tokens refilled evenly over the period, so N
+# is also the burst. A client over its own budget gets 429; when the route's
+# global budget is spent everyone gets 503 (load shedding). Both carry
+# Retry-After. The check runs before the view, i.e. before the body is parsed.
+#
+# Buckets live in the worker's memory unless RATE_LIMIT_REDIS_URL is set, in
+# which case all workers and hosts share them.
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Atomically refill and take one token; returns {allowed, tokens}
+_REDIS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+def parse_rate(rate):
+    """'5/minute' -> (capacity 5, 5/60 tokens per second)."""
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period]
+
+
+class MemoryBuckets:
+    def __init__(self, max_keys):
+        self._buckets = OrderedDict()  # key -> [tokens, last refill]
+        self._max_keys = max_keys
+        self._lock = Lock()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                # Forget the least recently seen clients first
+                while len(self._buckets) > self._max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, bucket[0]
+            return False, bucket[0]
+
+
+class RedisBuckets:
+    def __init__(self, url):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05)
+        self._script = self._client.register_script(_REDIS_SCRIPT)
+
+    def take(self, key, capacity, rate):
+        allowed, tokens = self._script(keys=[f'ratelimit:{key}'], args=[capacity, rate])
+        return bool(allowed), float(tokens)
+
+
+_memory = MemoryBuckets(Config.RATE_LIMIT_MAX_KEYS)
+_shared = RedisBuckets(Config.RATE_LIMIT_REDIS_URL) if redis and Config.RATE_LIMIT_REDIS_URL else None
+
+
+def _take(key, capacity, rate):
+    if _shared is not None:
+        try:
+            return _shared.take(key, capacity, rate)
+        except Exception as e:
+            # Keep limiting per worker rather than failing the request
+            print(f"❌ Shared rate limit store unavailable: {e}")
+    return _memory.take(key, capacity, rate)
+
+
+def client_ip():
+    """Remote address, taking RATE_LIMIT_TRUSTED_PROXIES hops of X-Forwarded-For."""
+    hops = Config.RATE_LIMIT_TRUSTED_PROXIES
+    if hops:
+        forwarded = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.remote_addr or 'unknown'
+
+
+def _reject(status, scope, tokens, rate):
+    metrics.inc('ratelimit_rejected_total', {'endpoint': request.endpoint, 'scope': scope})
+    retry_after = max(1, math.ceil((1 - tokens) / rate))
+    message = 'Too many requests, please slow down' if status == 429 else 'Server busy, please retry shortly'
+    return jsonify({'error': message}), status, {'Retry-After': str(retry_after)}
+
+
+def rate_limit(per_ip=None, total=None):
+    """Limit a view per client IP and/or across all clients."""
+    ip_limit = parse_rate(per_ip) if per_ip else None
+    total_limit = parse_rate(total) if total else None
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not Config.RATE_LIMIT_ENABLED or request.method == 'OPTIONS':
+                return f(*args, **kwargs)
+            if ip_limit:
+                allowed, tokens = _take(f'{request.endpoint}:ip:{client_ip()}', *ip_limit)
+                if not allowed:
+                    return _reject(429, 'ip', tokens, ip_limit[1])
+            if total_limit:
+                allowed, tokens = _take(f'{request.endpoint}:total', *total_limit)
+                if not allowed:
+                    return _reject(503, 'total', tokens, total_limit[1])
+            metrics.inc('ratelimit_allowed_total', {'endpoint': request.endpoint})
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+metrics.HELP_EXTRA.update({
+    'ratelimit_allowed_total': ('counter', 'Requests that passed their rate limits'),
+    'ratelimit_rejected_total': ('counter', 'Requests rejected by a rate limit (scope ip = 429, total = 503)'),
+})
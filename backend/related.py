@@ -0,0 +1,240 @@
+import heapq
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from pymongo import ReplaceOne
+from cache import invalidate
+from config import Config
+from models import blogs_collection, projects_collection, related_collection
+from search import tokenize, text_of
+
+# Precomputed "related content": TF-IDF cosine similarity between the items of
+# one collection, top RELATED_TOP_K neighbours stored per item in
+# related_content as {_id: "<collection>:<item _id>", id, items: [...]}.
+# Serving is a single indexed find_one. Writes are handled on a background
+# thread: IDF weights depend on every item, so each update reloads and
+# re-vectorizes the whole collection, then rewrites only the rows the writes
+# can have changed. Writes landing within RELATED_DEBOUNCE_MS of each other
+# are coalesced into one such pass.
+
+# Collection -> (collection, {field: weight}, fields copied into each neighbour)
+SOURCES = {
+    'blogs': (blogs_collection, {'title': 2, 'description': 1, 'category': 2},
+              ('id', 'title', 'description', 'image', 'category', 'date', 'read_time')),
+    'projects': (projects_collection, {'title': 2, 'description': 1, 'tags': 2, 'category': 2},
+                 ('id', 'title', 'description', 'image', 'category', 'tags')),
+}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='related')
+_pending = {}     # collection -> queries written since its last pass, None for a full rebuild
+_scheduled = {}   # collection -> future of the pass that will pick up _pending
+_pending_lock = Lock()
+
+
+def cache_name(name):
+    """Name the related endpoints are cached under in cache.py."""
+    return f'{name}_related'
+
+
+def _row_id(name, item):
+    return f'{name}:{item}'
+
+
+def _load(name):
+    collection, fields, summary = SOURCES[name]
+    projection = dict.fromkeys(list(fields) + list(summary), 1)
+    return {doc['_id']: doc for doc in collection.find({}, projection)}
+
+
+def _vectors(name, docs):
+    """L2-normalised TF-IDF vectors, plus term -> [(item, weight)] postings."""
+    fields = SOURCES[name][1]
+    counts = {}
+    df = Counter()
+    for key, doc in docs.items():
+        terms = Counter()
+        for field, weight in fields.items():
+            for token in tokenize(text_of(doc.get(field))):
+                terms[token] += weight
+        counts[key] = terms
+        df.update(terms.keys())
+
+    n = len(docs)
+    vectors = {}
+    postings = {}
+    for key, terms in counts.items():
+        vector = {t: (1 + math.log(tf)) * (math.log((1 + n) / (1 + df[t])) + 1)
+                  for t, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vector = {t: w / norm for t, w in vector.items()}
+        vectors[key] = vector
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((key, weight))
+    return vectors, postings
+
+
+def _similar(key, vectors, postings):
+    """Cosine similarity of `key` with every item sharing a term with it."""
+    scores = Counter()
+    for term, weight in vectors[key].items():
+        for other, other_weight in postings[term]:
+            if other != key:
+                scores[other] += weight * other_weight
+    return scores
+
+
+def _row(name, key, docs, vectors, postings):
+    summary = SOURCES[name][2]
+    scores = _similar(key, vectors, postings)
+    top = heapq.nlargest(Config.RELATED_TOP_K, scores.items(), key=lambda item: item[1])
+    return {
+        '_id': _row_id(name, key),
+        'collection': name,
+        'item': key,
+        'id': docs[key].get('id'),
+        'items': [{'_id': other, **{f: docs[other].get(f) for f in summary}, 'score': round(score, 4)}
+                  for other, score in top],
+        'updated_at': datetime.utcnow(),
+    }
+
+
+def rebuild(name):
+    """Recompute every row of `name` and drop rows of deleted items."""
+    docs = _load(name)
+    vectors, postings = _vectors(name, docs)
+    rows = [ReplaceOne({'_id': _row_id(name, key)}, _row(name, key, docs, vectors, postings), upsert=True)
+            for key in docs]
+    if rows:
+        related_collection.bulk_write(rows, ordered=False)
+    related_collection.delete_many({'collection': name,
+                                    '_id': {'$nin': [_row_id(name, key) for key in docs]}})
+    invalidate(cache_name(name))
+
+
+def _row_query(name, query):
+    row_query = {'collection': name}
+    if '_id' in query:
+        row_query['item'] = query['_id']
+    if 'id' in query:
+        row_query['id'] = query['id']
+    return row_query
+
+
+def _update(name, queries):
+    docs = _load(name)
+    changed = {key for key, doc in docs.items()
+               if any(all(doc.get(field) == value for field, value in query.items())
+                      for query in queries)}
+
+    # Rows of items the writes touched, including ones that no longer exist
+    rows = related_collection.find({'$or': [_row_query(name, query) for query in queries]}, {'item': 1})
+    removed = {row['item'] for row in rows} - set(docs)
+    changed |= removed
+
+    vectors, postings = _vectors(name, docs)
+    affected = {key for key in changed if key in docs}
+
+    # Rows that listed a changed item, or whose weakest neighbour it now beats
+    for row in related_collection.find({'collection': name}, {'item': 1, 'items._id': 1, 'items.score': 1}):
+        if row['item'] not in docs or row['item'] in affected:
+            continue
+        items = row.get('items', [])
+        if any(item['_id'] in changed for item in items):
+            affected.add(row['item'])
+            continue
+        threshold = items[-1]['score'] if len(items) >= Config.RELATED_TOP_K else -1
+        vector = vectors[row['item']]
+        for key in changed - removed:
+            if sum(w * vectors[key].get(t, 0) for t, w in vector.items()) > threshold:
+                affected.add(row['item'])
+                break
+
+    writes = [ReplaceOne({'_id': _row_id(name, key)}, _row(name, key, docs, vectors, postings), upsert=True)
+              for key in affected]
+    if writes:
+        related_collection.bulk_write(writes, ordered=False)
+    if removed:
+        related_collection.delete_many({'_id': {'$in': [_row_id(name, key) for key in removed]}})
+    invalidate(cache_name(name))
+
+
+def _run_pending(name):
+    while True:
+        time.sleep(Config.RELATED_DEBOUNCE_MS / 1000)  # let a burst of writes land first
+        with _pending_lock:
+            if name not in _pending:
+                del _scheduled[name]
+                return
+            queries = _pending.pop(name)
+        try:
+            if queries is None:
+                rebuild(name)
+            else:
+                _update(name, queries)
+        except Exception as e:
+            print(f"❌ Could not update related {name}: {e}")
+
+
+def refresh(name, query=None):
+    """Recompute the rows a write to `name` through `query` may have changed.
+
+    Runs in the background, together with any other writes to `name` in the
+    same burst; the related endpoints pick up the new rows once the returned
+    future is done.
+    """
+    if name not in SOURCES:
+        return None
+    with _pending_lock:
+        queries = _pending.get(name, [])
+        if queries is None or query is None or not set(query) <= {'id', '_id'}:
+            _pending[name] = None  # anything else is a full rebuild
+        else:
+            _pending[name] = queries + [query]
+        future = _scheduled.get(name)
+        if future is None:
+            future = _scheduled[name] = _executor.submit(_run_pending, name)
+    return future
+
+
+def ensure_built():
+    """Build rows for collections that have none yet (first boot)."""
+    for name, (collection, _, _) in SOURCES.items():
+        if (related_collection.find_one({'collection': name}, {'_id': 1}) is None
+                and collection.find_one({}, {'_id': 1}) is not None):
+            rebuild(name)
+
+
+def row_filter(name, item):
+    """Filter for the row of one item, given its numeric id or ObjectId string."""
+    if item.isdigit():
+        return {'collection': name, 'id': int(item)}
+    return {'_id': _row_id(name, item)}
+
+
+def limited(items, limit):
+    """`items` capped by a ?limit= value, clamped to 1..RELATED_TOP_K.
+
+    A missing or non-numeric limit returns every item.
+    """
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return items
+    return items[:max(1, min(limit, Config.RELATED_TOP_K))]
+
+
+def lookup(name, item, limit=None):
+    """Neighbours of one item, by numeric id or ObjectId string."""
+    row = related_collection.find_one(row_filter(name, item), {'items': 1})
+    return limited(row['items'] if row else [], limit)
+
+
+if __name__ == '__main__':
+    # python related.py [blogs|projects ...]  -- recompute everything
+    for name in sys.argv[1:] or SOURCES:
+        rebuild(name)
+        print(f"✅ Rebuilt related {name}")
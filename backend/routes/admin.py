@@ -1,10 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, g
 import os
 from dotenv import load_dotenv
-import jwt
 import sys
-from datetime import datetime, timedelta
-from auth import auth_required
+from datetime import datetime
+from auth import auth_required, issue_token, revoke
+from ratelimit import rate_limit
+from cache import invalidate
+from sequences import allocate_id
+import slow_queries
+import search
+import related
+import snapshot
+import transfer
 from bson import ObjectId
 import sys
 
@@ -26,6 +33,7 @@ admin_bp = Blueprint('admin', __name__)
 # ADMIN AUTH
 # -------------------------------
 @admin_bp.route('/admin/login', methods=['POST', 'OPTIONS'])
+@rate_limit(per_ip='10/minute', total='20/second')
 def admin_login():
     if request.method == 'OPTIONS':
         return '', 204
@@ -40,10 +48,7 @@ def admin_login():
             password == os.getenv('ADMIN_PASSWORD', 'adminpassword')):
             
             # Generate token
-            token = jwt.encode({
-                'sub': username,
-                'exp': datetime.utcnow() + timedelta(hours=24)
-            }, os.getenv('JWT_SECRET', 'secret_key'), algorithm='HS256')
+            token = issue_token(username)
             
             return jsonify({'token': token}), 200
         else:
@@ -57,6 +62,17 @@ def admin_login():
 def verify_token():
     return jsonify({'message': 'Token is valid'})
 
+@admin_bp.route('/admin/logout', methods=['POST'])
+@auth_required
+def admin_logout():
+    try:
+        revoke(g.admin_token)
+        return jsonify({'message': 'Logged out'})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 # -------------------------------
 # SERVICE MANAGEMENT
@@ -77,8 +93,7 @@ def add_service():
         data = request.get_json()
         
         # Get the next ID
-        last_service = services_collection.find_one(sort=[("id", -1)])
-        next_id = last_service['id'] + 1 if last_service else 1
+        next_id = allocate_id(services_collection)
         
         service = {
             "id": next_id,
@@ -92,6 +107,8 @@ def add_service():
         }
         
         services_collection.insert_one(service)
+        invalidate('services')
+        search.refresh('services', {"id": next_id})
         return jsonify({'message': 'Service added successfully', 'id': next_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -115,6 +132,8 @@ def update_service(service_id):
             {"id": service_id}, 
             {"$set": update_data}
         )
+        invalidate('services')
+        search.refresh('services', {"id": service_id})
         
         if result.matched_count:
             return jsonify({'message': 'Service updated successfully'})
@@ -128,6 +147,8 @@ def update_service(service_id):
 def delete_service(service_id):
     try:
         result = services_collection.delete_one({"id": service_id})
+        invalidate('services')
+        search.refresh('services', {"id": service_id})
         
         if result.deleted_count:
             return jsonify({'message': 'Service deleted successfully'})
@@ -156,8 +177,7 @@ def add_testimonial():
         data = request.get_json()
         
         # Get the next ID
-        last_testimonial = testimonials_collection.find_one(sort=[("id", -1)])
-        next_id = last_testimonial['id'] + 1 if last_testimonial else 1
+        next_id = allocate_id(testimonials_collection)
         
         testimonial = {
             "id": next_id,
@@ -170,6 +190,7 @@ def add_testimonial():
         }
         
         testimonials_collection.insert_one(testimonial)
+        invalidate('testimonials')
         return jsonify({'message': 'Testimonial added successfully', 'id': next_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -195,6 +216,7 @@ def update_testimonial(testimonial_id):
             query = {"_id": ObjectId(testimonial_id)}
         
         result = testimonials_collection.update_one(query, {"$set": update_data})
+        invalidate('testimonials')
         
         if result.matched_count:
             return jsonify({'message': 'Testimonial updated successfully'})
@@ -213,6 +235,7 @@ def delete_testimonial(testimonial_id):
             query = {"_id": ObjectId(testimonial_id)}
         
         result = testimonials_collection.delete_one(query)
+        invalidate('testimonials')
         
         if result.deleted_count:
             return jsonify({'message': 'Testimonial deleted successfully'})
@@ -229,12 +252,7 @@ def delete_testimonial(testimonial_id):
 @auth_required
 def get_blogs_admin():
     try:
-        blogs = list(blogs_collection.find({}))
-        # Convert ObjectId to string for JSON serialization
-        for blog in blogs:
-            if '_id' in blog:
-                blog['_id'] = str(blog['_id'])
-        return jsonify(blogs)
+        return jsonify(blogs_collection.find({}))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -245,8 +263,7 @@ def add_blog():
         data = request.get_json()
         
         # Generate new ID
-        last_blog = blogs_collection.find_one(sort=[("id", -1)])
-        next_id = last_blog['id'] + 1 if last_blog and 'id' in last_blog else 1
+        next_id = allocate_id(blogs_collection)
         
         blog = {
             "id": next_id,
@@ -262,6 +279,9 @@ def add_blog():
         }
         
         result = blogs_collection.insert_one(blog)
+        invalidate('blogs')
+        search.refresh('blogs', {"id": next_id})
+        related.refresh('blogs', {"id": next_id})
         return jsonify({
             "message": "Blog added successfully",
             "id": next_id,
@@ -302,6 +322,9 @@ def update_blog(blog_id):
             query,
             {"$set": update_data}
         )
+        invalidate('blogs')
+        search.refresh('blogs', query)
+        related.refresh('blogs', query)
         
         if result.matched_count == 0:
             return jsonify({"error": "Blog not found"}), 404
@@ -327,6 +350,9 @@ def delete_blog(blog_id):
                 return jsonify({"error": "Invalid blog ID"}), 400
         
         result = blogs_collection.delete_one(query)
+        invalidate('blogs')
+        search.refresh('blogs', query)
+        related.refresh('blogs', query)
         
         if result.deleted_count == 0:
             return jsonify({"error": "Blog not found"}), 404
@@ -382,6 +408,7 @@ def update_about():
         if '_id' in data:
             del data['_id']
         about_collection.update_one({}, {'$set': data}, upsert=True)
+        invalidate('about')
         return jsonify({'message': 'About page updated successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -396,6 +423,7 @@ def update_about_section(section):
             {'$set': {section: data}},
             upsert=True
         )
+        invalidate('about')
         return jsonify({'message': f'{section} updated successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -408,11 +436,10 @@ def update_about_section(section):
 @auth_required
 def get_pricing_admin():
     try:
-        pricing_data = list(pricing_collection.find({}))
-        for plan in pricing_data:
-            plan['_id'] = str(plan['_id'])
-            if 'id' not in plan:
-                plan['id'] = str(plan['_id'])
+        # Plans without an integer id fall back to their ObjectId string
+        pricing_data = pricing_collection.aggregate([
+            {'$addFields': {'id': {'$ifNull': ['$id', {'$toString': '$_id'}]}}}
+        ])
         return jsonify(pricing_data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -422,8 +449,7 @@ def get_pricing_admin():
 def add_pricing_plan():
     try:
         data = request.get_json()
-        last_plan = pricing_collection.find_one(sort=[("id", -1)])
-        next_id = last_plan['id'] + 1 if last_plan and 'id' in last_plan else 1
+        next_id = allocate_id(pricing_collection)
         
         plan = {
             "id": next_id,
@@ -437,6 +463,7 @@ def add_pricing_plan():
             "updated_at": datetime.utcnow()
         }
         pricing_collection.insert_one(plan)
+        invalidate('pricing')
         return jsonify({'message': 'Pricing plan added successfully', 'id': next_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -463,6 +490,7 @@ def update_pricing_plan(plan_id):
             query = {"_id": ObjectId(plan_id)}
         
         result = pricing_collection.update_one(query, {"$set": update_data})
+        invalidate('pricing')
         
         if result.matched_count:
             return jsonify({'message': 'Pricing plan updated successfully'})
@@ -481,6 +509,7 @@ def delete_pricing_plan(plan_id):
             query = {"_id": ObjectId(plan_id)}
         
         result = pricing_collection.delete_one(query)
+        invalidate('pricing')
         
         if result.deleted_count:
             return jsonify({'message': 'Pricing plan deleted successfully'})
@@ -499,8 +528,7 @@ def add_client():
     try:
         data = request.get_json()
         
-        last_client = clients_collection.find_one(sort=[("id", -1)])
-        next_id = last_client['id'] + 1 if last_client and 'id' in last_client else 1
+        next_id = allocate_id(clients_collection)
         
         client = {
             "id": next_id,
@@ -511,6 +539,7 @@ def add_client():
         }
         
         clients_collection.insert_one(client)
+        invalidate('clients')
         return jsonify({'message': 'Client added successfully', 'id': next_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -526,12 +555,7 @@ from models import projects_collection
 @auth_required
 def get_projects_admin():
     try:
-        projects = list(projects_collection.find({}))
-        # Convert ObjectId to string for JSON serialization
-        for project in projects:
-            if '_id' in project:
-                project['_id'] = str(project['_id'])
-        return jsonify(projects)
+        return jsonify(projects_collection.find({}))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -542,8 +566,7 @@ def add_project():
         data = request.get_json()
         
         # Get the next ID
-        last_project = projects_collection.find_one(sort=[("id", -1)])
-        next_id = last_project['id'] + 1 if last_project and 'id' in last_project else 1
+        next_id = allocate_id(projects_collection)
         
         project = {
             "id": next_id,
@@ -557,6 +580,9 @@ def add_project():
         }
         
         projects_collection.insert_one(project)
+        invalidate('projects')
+        search.refresh('projects', {"id": next_id})
+        related.refresh('projects', {"id": next_id})
         return jsonify({'message': 'Project added successfully', 'id': next_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -591,6 +617,9 @@ def update_project(project_id):
             query,
             {"$set": update_data}
         )
+        invalidate('projects')
+        search.refresh('projects', query)
+        related.refresh('projects', query)
         
         if result.matched_count == 0:
             return jsonify({"error": "Project not found"}), 404
@@ -616,6 +645,9 @@ def delete_project(project_id):
                 return jsonify({"error": "Invalid project ID"}), 400
         
         result = projects_collection.delete_one(query)
+        invalidate('projects')
+        search.refresh('projects', query)
+        related.refresh('projects', query)
         
         if result.deleted_count == 0:
             return jsonify({"error": "Project not found"}), 404
@@ -634,8 +666,6 @@ def delete_project(project_id):
 def get_home_admin():
     try:
         home_data = home_collection.find_one({})
-        if home_data and '_id' in home_data:
-            home_data['_id'] = str(home_data['_id'])
         return jsonify(home_data or {})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -650,6 +680,7 @@ def update_home():
             
         # Update or insert home data
         result = home_collection.update_one({}, {'$set': data}, upsert=True)
+        invalidate('home')
         return jsonify({'message': 'Home page updated successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -664,6 +695,65 @@ def update_home_section(section_name):
             {'$set': {section_name: data}},
             upsert=True
         )
+        invalidate('home')
         return jsonify({'message': f'{section_name} section updated successfully'})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# -------------------------------
+# STATIC SNAPSHOT
+# -------------------------------
+@admin_bp.route('/admin/snapshot', methods=['POST'])
+@auth_required
+def build_snapshot():
+    try:
+        version = snapshot.build()
+        return jsonify({'message': 'Snapshot written', 'version': version}), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# -------------------------------
+# BULK EXPORT / IMPORT (NDJSON)
+# -------------------------------
+@admin_bp.route('/admin/export/<name>', methods=['GET'])
+@auth_required
+def export_collection(name):
+    if name not in transfer.COLLECTIONS:
+        return jsonify({'error': 'Unknown collection'}), 404
+    # Streamed from the cursor a chunk at a time
+    response = Response(transfer.export_lines(name), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.ndjson'
+    return response
+
+
+@admin_bp.route('/admin/import/<name>', methods=['POST'])
+@auth_required
+def import_collection(name):
+    if name not in transfer.COLLECTIONS:
+        return jsonify({'error': 'Unknown collection'}), 404
+    try:
+        # A multipart upload (field "file") or the raw NDJSON request body
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                return jsonify({'error': 'No file uploaded'}), 400
+            lines = upload.stream
+        else:
+            lines = request.stream
+        return jsonify(transfer.import_lines(name, lines)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# -------------------------------
+# SLOW QUERIES
+# -------------------------------
+@admin_bp.route('/admin/slow-queries', methods=['GET'])
+@auth_required
+def get_slow_queries():
+    try:
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        return jsonify(slow_queries.recent(limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,47 +1,116 @@
 from flask import Blueprint, jsonify, request
 from bson import ObjectId
+from bson.errors import InvalidId
 from models import blogs_collection
+from cache import cached, invalidate
+from config import Config
+from sequences import allocate_id
+from auth import auth_required
+import search
+import related
 
 blogs_bp = Blueprint("blogs_bp", __name__)
 
-# Get all blogs
+SUMMARY_FIELDS = {
+    "_id": 1,
+    "id": 1,
+    "title": 1,
+    "description": 1,
+    "image": 1,
+    "category": 1,
+    "date": 1,
+    "read_time": 1,
+}
+
+def list_query(args):
+    """Query, projection and page size for a blog listing request.
+
+    Raises InvalidId for a malformed exclude or cursor. Shared with the
+    async read path in asgi.py.
+    """
+    query = {}
+
+    category = args.get("category")
+    if category:
+        query["category"] = category
+
+    exclude = args.get("exclude")
+    if exclude:
+        if exclude.isdigit():
+            query["id"] = {"$ne": int(exclude)}
+        else:
+            query["_id"] = {"$ne": ObjectId(exclude)}
+
+    cursor = args.get("cursor")
+    if cursor:
+        query.setdefault("_id", {})["$gt"] = ObjectId(cursor)
+
+    limit = args.get("limit")
+    limit = int(limit) if limit and limit.lstrip("-").isdigit() else None
+    if limit is not None:
+        limit = max(1, min(limit, Config.BLOGS_MAX_LIMIT))
+
+    projection = dict(SUMMARY_FIELDS)
+    if args.get("content") == "1":
+        projection["content"] = 1
+
+    return query, projection, limit
+
+# Get blogs, oldest first
+#   ?category=  only blogs in this category
+#   ?exclude=   skip one blog, by numeric id or ObjectId
+#   ?limit=     page size; the next page's cursor is sent in X-Next-Cursor
+#   ?cursor=    continue after the blog with this ObjectId
+#   ?content=1  include the full body (omitted by default)
 @blogs_bp.route("/blogs", methods=["GET"])
+@cached("blogs")
 def get_blogs():
     try:
-        blogs = list(blogs_collection.find({}, {
-            "_id": 1,
-            "title": 1,
-            "description": 1,
-            "image": 1,
-            "category": 1,
-            "date": 1,
-            "read_time": 1,
-            "content": 1,  # Include full content here
-        }))
-        for blog in blogs:
-            blog["_id"] = str(blog["_id"])
-        return jsonify(blogs)
+        query, projection, limit = list_query(request.args)
+
+        results = blogs_collection.find(query, projection).sort("_id", 1)
+        if limit is not None:
+            results = results.limit(limit)
+
+        blogs = list(results)
+        response = jsonify(blogs)
+        if limit is not None and len(blogs) == limit:
+            response.headers["X-Next-Cursor"] = str(blogs[-1]["_id"])
+        return response
+    except InvalidId:
+        return jsonify({"error": "Invalid blog ID or cursor"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # Get single blog by ID
 @blogs_bp.route("/blogs/<id>", methods=["GET"])
+@cached("blogs")
 def get_blog(id):
     try:
         blog = blogs_collection.find_one({"_id": ObjectId(id)})
         if not blog:
             return jsonify({"error": "Blog not found"}), 404
-        blog["_id"] = str(blog["_id"])
         return jsonify(blog)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Related blogs, precomputed by related.py (?limit= caps the count)
+@blogs_bp.route("/blogs/<id>/related", methods=["GET"])
+@cached(related.cache_name("blogs"))
+def get_related_blogs(id):
+    try:
+        return jsonify(related.lookup("blogs", id, request.args.get("limit")))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # Create a new blog
 @blogs_bp.route("/blogs", methods=["POST"])
+@auth_required
 def create_blog():
     try:
         data = request.json
         result = blogs_collection.insert_one({
+            "id": allocate_id(blogs_collection),
             "title": data.get("title"),
             "category": data.get("category"),
             "description": data.get("description"),
@@ -50,12 +119,16 @@ def create_blog():
             "read_time": data.get("read_time"),
             "content": data.get("content")
         })
+        invalidate("blogs")
+        search.refresh("blogs", {"_id": result.inserted_id})
+        related.refresh("blogs", {"_id": result.inserted_id})
         return jsonify({"message": "Blog created", "id": str(result.inserted_id)}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # Update blog
 @blogs_bp.route("/blogs/<id>", methods=["PUT"])
+@auth_required
 def update_blog(id):
     try:
         data = request.json
@@ -71,6 +144,9 @@ def update_blog(id):
                 "content": data.get("content")
             }}
         )
+        invalidate("blogs")
+        search.refresh("blogs", {"_id": ObjectId(id)})
+        related.refresh("blogs", {"_id": ObjectId(id)})
         if result.matched_count == 0:
             return jsonify({"error": "Blog not found"}), 404
         return jsonify({"message": "Blog updated"})
@@ -79,9 +155,13 @@ def update_blog(id):
 
 # Delete blog
 @blogs_bp.route("/blogs/<id>", methods=["DELETE"])
+@auth_required
 def delete_blog(id):
     try:
         result = blogs_collection.delete_one({"_id": ObjectId(id)})
+        invalidate("blogs")
+        search.refresh("blogs", {"_id": ObjectId(id)})
+        related.refresh("blogs", {"_id": ObjectId(id)})
         if result.deleted_count == 0:
             return jsonify({"error": "Blog not found"}), 404
         return jsonify({"message": "Blog deleted"})
@@ -1,12 +1,16 @@
 from flask import Blueprint, jsonify, request
 from models import clients_collection
+from cache import cached, invalidate
+from sequences import allocate_id
 from bson import ObjectId
 from datetime import datetime
 import os
+from auth import auth_required
 
 clients_bp = Blueprint('clients', __name__)
 
 @clients_bp.route('/clients', methods=['GET'])
+@cached('clients')
 def get_clients():
     try:
         clients = list(clients_collection.find({}, {'_id': 0}))
@@ -15,22 +19,17 @@ def get_clients():
         return jsonify({"error": str(e)}), 500
 
 @clients_bp.route('/admin/clients', methods=['GET', 'POST'])
+@auth_required
 def manage_clients():
     try:
         if request.method == 'GET':
-            clients = list(clients_collection.find({}))
-            # Convert ObjectId to string for JSON serialization
-            for client in clients:
-                if '_id' in client:
-                    client['_id'] = str(client['_id'])
-            return jsonify(clients)
+            return jsonify(clients_collection.find({}))
         
         elif request.method == 'POST':
             data = request.json
             
             # Generate new ID
-            last_client = clients_collection.find_one(sort=[("id", -1)])
-            new_id = last_client['id'] + 1 if last_client else 1
+            new_id = allocate_id(clients_collection)
             
             client = {
                 "id": new_id,
@@ -41,6 +40,7 @@ def manage_clients():
             }
             
             result = clients_collection.insert_one(client)
+            invalidate('clients')
             return jsonify({
                 "message": "Client added successfully",
                 "id": new_id,
@@ -51,6 +51,7 @@ def manage_clients():
         return jsonify({"error": str(e)}), 500
 
 @clients_bp.route('/admin/clients/<client_id>', methods=['PUT', 'DELETE'])
+@auth_required
 def manage_client(client_id):
     try:
         if request.method == 'PUT':
@@ -77,6 +78,7 @@ def manage_client(client_id):
                 query,
                 {"$set": update_data}
             )
+            invalidate('clients')
             
             if result.matched_count == 0:
                 return jsonify({"error": "Client not found"}), 404
@@ -96,6 +98,7 @@ def manage_client(client_id):
                     return jsonify({"error": "Invalid client ID"}), 400
             
             result = clients_collection.delete_one(query)
+            invalidate('clients')
             
             if result.deleted_count == 0:
                 return jsonify({"error": "Client not found"}), 404
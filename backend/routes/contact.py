@@ -1,20 +1,26 @@
 from flask import Blueprint, request, jsonify
-from config import Config
-from models import ContactMessage
-from pymongo import MongoClient
+from models import ContactMessage, faqs_collection
+from models import contact_messages_collection as contact_collection
 from datetime import datetime
-from bson import ObjectId
+from cache import cached
+from config import Config
+from auth import auth_required
+import inbox
+import ingest
+from ratelimit import rate_limit
 contact_bp = Blueprint('contact', __name__)
 
-# MongoDB connection
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.MONGODB_DBNAME]
-contact_collection = db['contact_messages']
-
 @contact_bp.route('/contact', methods=['POST'])
+@rate_limit(per_ip='5/minute', total='50/second')
 def submit_contact():
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not all(
+                str(data.get(field) or '').strip() for field in ('full_name', 'email', 'message')):
+            return jsonify({
+                "success": False,
+                "message": "full_name, email and message are required"
+            }), 400
 
         # Create new contact message
         contact_message = ContactMessage(
@@ -25,14 +31,20 @@ def submit_contact():
             created_at=datetime.utcnow()
         )
 
-        # Insert into MongoDB
-        result = contact_collection.insert_one(contact_message.to_dict())
+        # Queued and written to MongoDB in the next batch
+        message_id = ingest.submit(contact_collection, contact_message.to_dict())
 
         return jsonify({
             "success": True,
             "message": "Contact form submitted successfully",
-            "id": str(result.inserted_id)
-        }), 201
+            "id": str(message_id)
+        }), 202
+
+    except ingest.QueueFull:
+        return ingest.busy({
+            "success": False,
+            "message": "We're receiving a lot of messages right now, please try again shortly"
+        })
 
     except Exception as e:
         return jsonify({
@@ -41,40 +53,64 @@ def submit_contact():
         }), 500
 
 @contact_bp.route('/contact/faqs', methods=['GET'])
+@cached('faqs')
 def get_contact_faqs():
     try:
         # Get FAQs from MongoDB instead of JSON file
-        faqs = list(db.faqs.find({}, {'_id': 0}))
+        faqs = list(faqs_collection.find({}, {'_id': 0}))
         return jsonify(faqs)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # admin routes for contact messages
+#   ?status=    all (default), unread or read
+#   ?limit=     page size; the next page's cursor is sent in X-Next-Cursor
+#   ?cursor=    continue after the last message of the previous page
 @contact_bp.route('/admin/contact-messages', methods=['GET'])
+@auth_required
 def get_contact_messages():
     try:
-        # Get all contact messages, sorted by date (newest first)
-        messages = list(contact_collection.find().sort('created_at', -1))
-        
-        # Convert ObjectId to string for JSON serialization
-        for message in messages:
-            message['_id'] = str(message['_id'])
-            
-        return jsonify(messages)
+        status = request.args.get('status', 'all')
+        if status not in inbox.STATUS_FILTERS:
+            return jsonify({'error': 'status must be all, unread or read'}), 400
+        limit = request.args.get('limit', Config.INBOX_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, Config.INBOX_MAX_LIMIT))
+
+        # Newest first
+        messages, next_cursor = inbox.page(status, request.args.get('cursor'), limit)
+        response = jsonify(messages)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@contact_bp.route('/admin/contact-messages/unread-count', methods=['GET'])
+@auth_required
+def get_unread_count():
+    try:
+        return jsonify({'unread': inbox.unread_count()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@contact_bp.route('/admin/contact-messages/mark-all-read', methods=['PUT'])
+@auth_required
+def mark_all_contact_messages_read():
+    try:
+        updated = inbox.mark_all_read()
+        return jsonify({'message': 'All contact messages marked as read', 'updated': updated})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @contact_bp.route('/admin/contact-messages/<message_id>', methods=['PUT'])
+@auth_required
 def update_contact_message(message_id):
     try:
         data = request.get_json()
         
-        result = contact_collection.update_one(
-            {'_id': ObjectId(message_id)},
-            {'$set': data}
-        )
-        
-        if result.matched_count:
+        if inbox.update(message_id, data):
             return jsonify({'message': 'Contact message updated successfully'})
         else:
             return jsonify({'error': 'Contact message not found'}), 404
@@ -82,13 +118,12 @@ def update_contact_message(message_id):
         return jsonify({'error': str(e)}), 500
 
 @contact_bp.route('/admin/contact-messages/<message_id>', methods=['DELETE'])
+@auth_required
 def delete_contact_message(message_id):
     try:
-        result = contact_collection.delete_one({'_id': ObjectId(message_id)})
-        
-        if result.deleted_count:
+        if inbox.delete(message_id):
             return jsonify({'message': 'Contact message deleted successfully'})
         else:
             return jsonify({'error': 'Contact message not found'}), 404
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -1,9 +1,14 @@
 from flask import Blueprint, jsonify, request
 from models import faqs_collection
+from cache import cached, invalidate
+from sequences import allocate_id
+from auth import auth_required
+import search
 
 faqs_bp = Blueprint('faqs', __name__)
 
 @faqs_bp.route('/faqs', methods=['GET'])
+@cached('faqs')
 def get_faqs():
     try:
         faqs = list(faqs_collection.find({}, {'_id': 0}))
@@ -12,6 +17,7 @@ def get_faqs():
         return jsonify({"error": str(e)}), 500
 
 @faqs_bp.route('/admin/faqs', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@auth_required
 def manage_faqs():
     try:
         if request.method == 'GET':
@@ -21,8 +27,7 @@ def manage_faqs():
         elif request.method == 'POST':
             data = request.json
             # Generate new ID
-            last_faq = faqs_collection.find_one(sort=[("id", -1)])
-            new_id = last_faq['id'] + 1 if last_faq else 1
+            new_id = allocate_id(faqs_collection)
             
             faq = {
                 "id": new_id,
@@ -32,6 +37,8 @@ def manage_faqs():
             }
             
             faqs_collection.insert_one(faq)
+            invalidate('faqs')
+            search.refresh('faqs', {"id": new_id})
             return jsonify({"message": "FAQ added successfully"})
         
         elif request.method == 'PUT':
@@ -44,11 +51,15 @@ def manage_faqs():
                     "open": data.get('open', False)
                 }}
             )
+            invalidate('faqs')
+            search.refresh('faqs', {"id": data['id']})
             return jsonify({"message": "FAQ updated successfully"})
         
         elif request.method == 'DELETE':
             faq_id = request.args.get('id')
             faqs_collection.delete_one({"id": int(faq_id)})
+            invalidate('faqs')
+            search.refresh('faqs', {"id": int(faq_id)})
             return jsonify({"message": "FAQ deleted successfully"})
             
     except Exception as e:
@@ -1,27 +1,19 @@
 from flask import Blueprint, jsonify, request
 from models import home_collection
-import json
-import os
-from config import Config
+from cache import cached, invalidate
+from content import load_home
+from auth import auth_required
 
 home_bp = Blueprint('home', __name__)
 
 @home_bp.route('/home', methods=['GET'])
+@cached('home')
 def get_home():
     try:
-        # Try to get home data from MongoDB
-        home_data = home_collection.find_one({}, {'_id': 0})
-        
+        # Seeded from HOME_DATA on first read
+        home_data = load_home()
         if home_data:
             return jsonify(home_data)
-        
-        # If not found in DB, load from JSON file and save to DB
-        if os.path.exists(Config.HOME_DATA):
-            with open(Config.HOME_DATA, 'r') as f:
-                home_data = json.load(f)
-                home_collection.insert_one(home_data)
-                return jsonify(home_data)
-        
         return jsonify({"error": "Home data not found"}), 404
         
     except Exception as e:
@@ -30,10 +22,12 @@ def get_home():
 
 # ✅ Update whole home document with flat structure
 @home_bp.route('/admin/home', methods=['PUT'])
+@auth_required
 def update_home():
     try:
         data = request.get_json()
         result = home_collection.update_one({}, {'$set': data}, upsert=True)
+        invalidate('home')
         return jsonify({'message': 'Home data updated successfully'})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -41,10 +35,12 @@ def update_home():
 
 # ✅ Update only specific section with flat structure
 @home_bp.route('/admin/home/section/<section>', methods=['PUT'])
+@auth_required
 def update_home_section(section):
     try:
         data = request.get_json()
         result = home_collection.update_one({}, {'$set': {section: data}}, upsert=True)
+        invalidate('home')
         return jsonify({'message': f'{section} section updated successfully'})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
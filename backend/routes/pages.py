@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from flask import Blueprint, jsonify
+from models import (
+    projects_collection, testimonials_collection, clients_collection, faqs_collection)
+from cache import cached
+from content import load_home, load_about, load_services, load_pricing
+from config import Config
+
+pages_bp = Blueprint('pages', __name__)
+
+_executor = ThreadPoolExecutor(max_workers=Config.PAGE_BUNDLE_WORKERS)
+
+
+def _find_all(collection):
+    return lambda: list(collection.find({}, {'_id': 0}))
+
+
+# Reads shared by several pages. Keys match the collection names so the
+# bundle cache is invalidated by the same write routes as the single endpoints;
+# home, about, services and pricing go through the same loaders (seed on first
+# read, about default) as /api/home etc.
+SECTIONS = {
+    'home': lambda: load_home() or {},
+    'about': lambda: load_about({'_id': 0}),
+    'services': load_services,
+    'projects': _find_all(projects_collection),
+    'testimonials': _find_all(testimonials_collection),
+    'clients': _find_all(clients_collection),
+    'faqs': _find_all(faqs_collection),
+    'pricing': load_pricing,
+}
+
+# Page name -> sections returned by /api/pages/<name>. Add a page here to
+# expose a new bundle.
+PAGE_BUNDLES = {
+    'home': ['home', 'services', 'projects', 'testimonials', 'clients', 'faqs', 'pricing'],
+    'pricing': ['pricing', 'testimonials', 'clients', 'faqs'],
+    'services': ['services', 'testimonials', 'faqs'],
+    'about': ['about', 'services', 'testimonials', 'faqs'],
+}
+
+
+def build_bundle(sections):
+    """Run every section read concurrently and collect the results by name."""
+    # copy_context() keeps per-request state (e.g. the endpoint that Mongo
+    # command metrics are attributed to) visible inside the pool threads
+    futures = {name: _executor.submit(copy_context().run, SECTIONS[name]) for name in sections}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _bundle_view(sections):
+    def view():
+        try:
+            return jsonify(build_bundle(sections))
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    return view
+
+
+for page, sections in PAGE_BUNDLES.items():
+    pages_bp.add_url_rule(
+        f'/pages/{page}',
+        endpoint=page,
+        view_func=cached(*sections)(_bundle_view(sections)),
+        methods=['GET'],
+    )
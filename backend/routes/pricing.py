@@ -1,27 +1,14 @@
 from flask import Blueprint, jsonify
-from models import pricing_collection
-import json
-import os
+from cache import cached
+from content import load_pricing
 
 pricing_bp = Blueprint('pricing', __name__)
 
 @pricing_bp.route('/pricing', methods=['GET'])
+@cached('pricing')
 def get_pricing():
     try:
-
-        pricing_data = list(pricing_collection.find({}, {'_id': 0}))
-        
-        if not pricing_data:
-
-            json_path = os.path.join(os.path.dirname(__file__), '../data/pricing.json')
-            if os.path.exists(json_path):
-                with open(json_path, 'r') as f:
-                    pricing_data = json.load(f)
-                    # Insert into MongoDB for future requests
-                    if pricing_data:
-                        pricing_collection.insert_many(pricing_data)
-                        pricing_data = list(pricing_collection.find({}, {'_id': 0}))
-        
-        return jsonify(pricing_data)
+        # Seeded from data/pricing.json if the collection is empty
+        return jsonify(load_pricing())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
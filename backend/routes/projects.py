@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request
 from models import projects_collection
+from cache import cached
+import related
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -8,6 +10,7 @@ logger = logging.getLogger(__name__)
 projects_bp = Blueprint('projects', __name__)
 
 @projects_bp.route('/projects', methods=['GET'])
+@cached('projects')
 def get_projects():
     try:
         logger.info(f"Projects request received. Category: {request.args.get('category', 'All Blog')}")
@@ -28,6 +31,7 @@ def get_projects():
         return jsonify({"error": "Internal server error"}), 500
 
 @projects_bp.route('/filters', methods=['GET'])
+@cached('projects')
 def get_filters():
     try:
         # Get unique categories from MongoDB
@@ -36,4 +40,14 @@ def get_filters():
         return jsonify(filters)
     except Exception as e:
         logger.error(f"Error in get_filters: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal server error"}), 500
+
+# Related projects, precomputed by related.py (?limit= caps the count)
+@projects_bp.route('/projects/<id>/related', methods=['GET'])
+@cached(related.cache_name('projects'))
+def get_related_projects(id):
+    try:
+        return jsonify(related.lookup('projects', id, request.args.get('limit')))
+    except Exception as e:
+        logger.error(f"Error in get_related_projects: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify, request
+import search
+
+search_bp = Blueprint('search', __name__)
+
+# Search blogs, projects, services and FAQs
+#   ?q=      the query
+#   ?type=   blog, project, service or faq (repeatable); all types by default
+#   ?limit=  number of results, up to 50
+@search_bp.route('/search', methods=['GET'])
+def search_content():
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'Missing query parameter q'}), 400
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        types = set(request.args.getlist('type'))
+        return jsonify(search.search(q, types=types, limit=limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,33 +1,21 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
 from datetime import datetime
-import os
-import json
 from models import services_collection
 from auth import auth_required
+from cache import cached, invalidate
+from content import load_services
+from sequences import allocate_id
+import search
 
 services_bp = Blueprint('services', __name__)
 
 @services_bp.route('/services', methods=['GET'])
+@cached('services')
 def get_services():
     try:
-        services = list(services_collection.find({}, {'_id': 0}))
-        
-        # If no services in database, load from JSON file
-        if not services:
-            json_path = os.path.join(os.path.dirname(__file__), '../data/services.json')
-            if os.path.exists(json_path):
-                with open(json_path, 'r') as f:
-                    services = json.load(f)
-                    # Insert into MongoDB for future requests
-                    if services:
-                        # Add IDs to services from JSON
-                        for i, service in enumerate(services):
-                            service['id'] = i + 1
-                        services_collection.insert_many(services)
-                        services = list(services_collection.find({}, {'_id': 0}))
-        
-        return jsonify(services)
+        # Seeded from data/services.json if the collection is empty
+        return jsonify(load_services())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -35,11 +23,7 @@ def get_services():
 @auth_required
 def get_services_admin():
     try:
-        services = list(services_collection.find({}))
-        # Convert ObjectId to string for JSON serialization
-        for service in services:
-            service['_id'] = str(service['_id'])
-        return jsonify(services)
+        return jsonify(services_collection.find({}))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -50,8 +34,7 @@ def add_service():
         data = request.get_json()
         
         # Get the next ID
-        last_service = services_collection.find_one(sort=[("id", -1)])
-        next_id = last_service['id'] + 1 if last_service else 1
+        next_id = allocate_id(services_collection)
         
         service = {
             "id": next_id,
@@ -65,6 +48,8 @@ def add_service():
         }
         
         result = services_collection.insert_one(service)
+        invalidate('services')
+        search.refresh('services', {"id": next_id})
         return jsonify({'message': 'Service added successfully', 'id': str(result.inserted_id)}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -88,6 +73,8 @@ def update_service(service_id):
             {"id": int(service_id)}, 
             {"$set": update_data}
         )
+        invalidate('services')
+        search.refresh('services', {"id": int(service_id)})
         
         if result.matched_count:
             return jsonify({'message': 'Service updated successfully'})
@@ -101,6 +88,8 @@ def update_service(service_id):
 def delete_service(service_id):
     try:
         result = services_collection.delete_one({"id": int(service_id)})
+        invalidate('services')
+        search.refresh('services', {"id": int(service_id)})
         
         if result.deleted_count:
             return jsonify({'message': 'Service deleted successfully'})
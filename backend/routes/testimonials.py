@@ -1,12 +1,16 @@
 from flask import Blueprint, jsonify, request
 from models import testimonials_collection
+from cache import cached, invalidate
+from sequences import allocate_id
 from bson import ObjectId
 from datetime import datetime
 import os
+from auth import auth_required
 
 testimonials_bp = Blueprint('testimonials', __name__)
 
 @testimonials_bp.route('/testimonials', methods=['GET'])
+@cached('testimonials')
 def get_testimonials():
     try:
         testimonials = list(testimonials_collection.find({}, {'_id': 0}))
@@ -15,29 +19,21 @@ def get_testimonials():
         return jsonify({"error": str(e)}), 500
 
 @testimonials_bp.route('/admin/testimonials', methods=['GET'])
+@auth_required
 def get_testimonials_admin():
     try:
-        testimonials = list(testimonials_collection.find({}))
-        # Convert ObjectId to string for JSON serialization
-        for testimonial in testimonials:
-            if '_id' in testimonial:
-                testimonial['_id'] = str(testimonial['_id'])
-        return jsonify(testimonials)
+        return jsonify(testimonials_collection.find({}))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @testimonials_bp.route('/admin/testimonials', methods=['POST'])
+@auth_required
 def add_testimonial():
     try:
         data = request.json
         
-        # Generate new ID - handle cases where id field might not exist
-        last_testimonial = testimonials_collection.find_one(sort=[("id", -1)])
-        
-        if last_testimonial and 'id' in last_testimonial:
-            new_id = last_testimonial['id'] + 1
-        else:
-            new_id = 1
+        # Generate new ID
+        new_id = allocate_id(testimonials_collection)
         
         testimonial = {
             "id": new_id,
@@ -50,6 +46,7 @@ def add_testimonial():
         }
         
         result = testimonials_collection.insert_one(testimonial)
+        invalidate('testimonials')
         return jsonify({
             "message": "Testimonial added successfully",
             "id": new_id,
@@ -60,6 +57,7 @@ def add_testimonial():
         return jsonify({"error": str(e)}), 500
 
 @testimonials_bp.route('/admin/testimonials/<testimonial_id>', methods=['PUT'])
+@auth_required
 def update_testimonial(testimonial_id):
     try:
         data = request.json
@@ -87,6 +85,7 @@ def update_testimonial(testimonial_id):
             query,
             {"$set": update_data}
         )
+        invalidate('testimonials')
         
         if result.matched_count == 0:
             return jsonify({"error": "Testimonial not found"}), 404
@@ -97,6 +96,7 @@ def update_testimonial(testimonial_id):
         return jsonify({"error": str(e)}), 500
 
 @testimonials_bp.route('/admin/testimonials/<testimonial_id>', methods=['DELETE'])
+@auth_required
 def delete_testimonial(testimonial_id):
     try:
         # Try to find by ID first (numeric)
@@ -111,6 +111,7 @@ def delete_testimonial(testimonial_id):
                 return jsonify({"error": "Invalid testimonial ID"}), 400
         
         result = testimonials_collection.delete_one(query)
+        invalidate('testimonials')
         
         if result.deleted_count == 0:
             return jsonify({"error": "Testimonial not found"}), 404
@@ -0,0 +1,194 @@
+import math
+import re
+from collections import Counter
+from threading import Lock
+from models import blogs_collection, projects_collection, services_collection, faqs_collection
+import coherence
+
+# In-process inverted index over the searchable collections, scored with BM25.
+# Built once per worker at warm-up; admin write routes call refresh() with the
+# query they just wrote through so only those documents are re-tokenized.
+
+K1 = 1.2
+B = 0.75
+
+# Name -> (result type, collection, {field: weight}, title field, summary field).
+# A field's tokens count `weight` times, so title hits outrank body hits.
+SOURCES = {
+    'blogs': ('blog', blogs_collection, {'title': 3, 'description': 2, 'category': 1, 'content': 1},
+              'title', 'description'),
+    'projects': ('project', projects_collection, {'title': 3, 'tags': 2, 'category': 1, 'description': 1},
+                 'title', 'description'),
+    'services': ('service', services_collection, {'title': 3, 'desc': 1, 'list': 1}, 'title', 'desc'),
+    'faqs': ('faq', faqs_collection, {'question': 3, 'answer': 1}, 'question', 'answer'),
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'i', 'in', 'is',
+    'it', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'we', 'what', 'with', 'you', 'your',
+}
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+_postings = {}   # term -> {doc key: weighted term frequency}
+_docs = {}       # doc key -> {'length', 'terms', 'result', 'id', '_id'}
+_total_length = 0
+_built = False
+_dirty = set()   # collections written to while the index was being built
+_lock = Lock()
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def text_of(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ' '.join(text_of(v) for v in value)
+    if isinstance(value, dict):
+        return ' '.join(text_of(v) for v in value.values())
+    return ''
+
+
+def _summary(text, length=160):
+    text = ' '.join(text.split())
+    return text if len(text) <= length else text[:length].rsplit(' ', 1)[0] + '…'
+
+
+def _add(name, doc):
+    global _total_length
+    kind, _, fields, title_field, summary_field = SOURCES[name]
+    terms = Counter()
+    for field, weight in fields.items():
+        for token in tokenize(text_of(doc.get(field))):
+            terms[token] += weight
+    key = (name, str(doc['_id']))
+    length = sum(terms.values())
+    _docs[key] = {
+        'length': length,
+        'terms': terms,
+        'id': doc.get('id'),
+        '_id': doc['_id'],
+        'result': {
+            'type': kind,
+            'id': doc.get('id'),
+            '_id': str(doc['_id']),
+            'title': text_of(doc.get(title_field)),
+            'summary': _summary(text_of(doc.get(summary_field))),
+        },
+    }
+    for term, tf in terms.items():
+        _postings.setdefault(term, {})[key] = tf
+    _total_length += length
+
+
+def _remove(key):
+    global _total_length
+    doc = _docs.pop(key)
+    for term in doc['terms']:
+        posting = _postings.get(term)
+        if posting is not None:
+            posting.pop(key, None)
+            if not posting:
+                del _postings[term]
+    _total_length -= doc['length']
+
+
+def _matches(doc, query):
+    # Write routes address documents by `id` or `_id`; anything else is
+    # treated as "may match" and triggers a full refresh of the collection.
+    return all(doc.get(field) == value for field, value in query.items())
+
+
+def refresh(name, query=None):
+    """Re-index the documents of `name` matching `query` (all of them if None).
+
+    Call after a write with the same filter the write used; documents that
+    no longer exist drop out of the index.
+    """
+    if name not in SOURCES:
+        return
+    if not _built:
+        with _lock:
+            _dirty.add(name)
+        return
+    if query is not None and not set(query) <= {'id', '_id'}:
+        query = None
+    collection = SOURCES[name][1]
+    fresh = list(collection.find(query or {}))
+    with _lock:
+        stale = [key for key, doc in _docs.items()
+                 if key[0] == name and (query is None or _matches(doc, query))]
+        for key in stale:
+            _remove(key)
+        for doc in fresh:
+            _add(name, doc)
+
+
+def _on_change(changed, baseline):
+    # Writes made in other workers; this worker's own writes call refresh()
+    # directly. The baseline needs nothing: build() reads current data.
+    if not baseline:
+        for name in changed:
+            refresh(name)
+
+
+coherence.on_change(_on_change)
+
+
+def build():
+    """(Re)build the whole index from MongoDB."""
+    global _built, _total_length
+    with _lock:
+        _dirty.clear()
+    loaded = {name: list(source[1].find({})) for name, source in SOURCES.items()}
+    with _lock:
+        _postings.clear()
+        _docs.clear()
+        _total_length = 0
+        for name, docs in loaded.items():
+            for doc in docs:
+                _add(name, doc)
+        _built = True
+        dirty = list(_dirty)
+    # Writes that landed while the collections were being read
+    for name in dirty:
+        refresh(name)
+
+
+def search(q, types=None, limit=10):
+    """Top `limit` results for `q`, optionally restricted to some result types."""
+    if not _built:
+        build()
+    terms = set(tokenize(q))
+    scores = Counter()
+    with _lock:
+        n = len(_docs)
+        if not n or not terms:
+            return []
+        avg_length = _total_length / n
+        for term in terms:
+            posting = _postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, tf in posting.items():
+                length = _docs[key]['length']
+                scores[key] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+        results = []
+        ranked = scores.most_common() if types else scores.most_common(limit)
+        for key, score in ranked:
+            result = _docs[key]['result']
+            if types and result['type'] not in types:
+                continue
+            results.append({**result, 'score': round(score, 4)})
+            if len(results) == limit:
+                break
+    return results
+
+
+def stats():
+    with _lock:
+        return {'documents': len(_docs), 'terms': len(_postings), 'built': _built}
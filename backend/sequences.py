@@ -0,0 +1,37 @@
+from threading import Lock
+from pymongo import ReturnDocument
+from models import counters_collection
+
+# Integer `id`s are handed out from one counter document per collection:
+#   {"_id": "<collection name>", "seq": <last id handed out>}
+# so a create is a single atomic $inc instead of find-max-then-insert.
+_synced = set()
+_sync_lock = Lock()
+
+
+def sync_counter(collection):
+    """Raise the counter to the collection's current max id (never lowers it)."""
+    last = collection.find_one({'id': {'$type': 'number'}}, {'id': 1}, sort=[('id', -1)])
+    max_id = last['id'] if last else 0
+    counters_collection.update_one(
+        {'_id': collection.name},
+        {'$max': {'seq': max_id}},
+        upsert=True
+    )
+
+
+def allocate_id(collection, count=1):
+    """Reserve `count` consecutive ids for `collection` and return the first."""
+    if collection.name not in _synced:
+        with _sync_lock:
+            if collection.name not in _synced:
+                sync_counter(collection)
+                _synced.add(collection.name)
+
+    counter = counters_collection.find_one_and_update(
+        {'_id': collection.name},
+        {'$inc': {'seq': count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter['seq'] - count + 1
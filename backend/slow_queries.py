@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+from pymongo import monitoring
+from config import Config
+from db import get_client, get_db
+from models import content_versions_collection
+import metrics
+
+# Flags MongoDB commands slower than SLOW_QUERY_MS. Each record has the
+# collection, the filter/sort shape with values redacted and the endpoint that
+# issued it; the first time a shape is seen its queryPlanner explain is
+# captured too. Records go to a capped collection or a rotating JSON-lines file.
+
+EXPLAINABLE = {'find', 'aggregate', 'count', 'distinct', 'update', 'delete', 'findAndModify'}
+SHAPE_FIELDS = ('filter', 'sort', 'projection', 'query', 'key', 'pipeline',
+                'updates', 'deletes', 'update', 'remove')
+# Command fields and pipeline stages whose numbers are sort directions or
+# projection flags; a number anywhere else is a value
+DIRECTION_FIELDS = {'sort', 'projection'}
+DIRECTION_STAGES = {'$sort', '$project'}
+# Session and cluster bookkeeping that can't be replayed through explain
+SESSION_FIELDS = {'lsid', 'txnNumber', '$clusterTime', '$db', '$readPreference',
+                  'autocommit', 'startTransaction'}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-queries')
+_explained = set()
+_explained_lock = Lock()
+_file_logger = None
+
+
+def redact(value):
+    """Keep field names and operators, replace every value with its type."""
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Pipelines and updates keep their structure; value lists collapse
+        if value and all(isinstance(v, dict) for v in value):
+            return [redact(v) for v in value]
+        return ['?']
+    return '?'
+
+
+def _directions(value):
+    # A sort or projection keeps its 1/-1/0; anything else in it ($elemMatch,
+    # $slice, expressions) is redacted like a filter
+    if not isinstance(value, dict):
+        return redact(value)
+    return {k: v if isinstance(v, (int, float)) and not isinstance(v, bool) and v in (1, -1, 0)
+            else redact(v)
+            for k, v in value.items()}
+
+
+def _pipeline(stages):
+    if not isinstance(stages, list) or not all(isinstance(s, dict) for s in stages):
+        return redact(stages)
+    return [{k: _directions(v) if k in DIRECTION_STAGES else redact(v) for k, v in stage.items()}
+            for stage in stages]
+
+
+def command_shape(command):
+    shape = {}
+    for field in SHAPE_FIELDS:
+        if field not in command:
+            continue
+        if field in DIRECTION_FIELDS:
+            shape[field] = _directions(command[field])
+        elif field == 'pipeline':
+            shape[field] = _pipeline(command[field])
+        else:
+            shape[field] = redact(command[field])
+    if isinstance(command.get('key'), str):
+        shape['key'] = command['key']  # distinct's field name is not a value
+    return shape
+
+
+def _target(command_name, command):
+    # getMore names its cursor id first and the collection in "collection"
+    collection = command.get('collection' if command_name == 'getMore' else command_name)
+    return collection if isinstance(collection, str) else None
+
+
+class SlowQueryListener(monitoring.CommandListener):
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        # _explain()'s replays run as "explain", which is never captured
+        if event.command_name not in EXPLAINABLE and event.command_name not in ('insert', 'getMore'):
+            return
+        # Storing a record while MongoDB is slow must not produce another one
+        if _target(event.command_name, event.command) == Config.SLOW_QUERY_COLLECTION:
+            return
+        # Change streams and other awaitData cursors wait maxTimeMS on purpose
+        # (coherence.py's for CONTENT_VERSIONS_POLL_MS); that's not slowness
+        if event.command_name == 'getMore' and (
+                'maxTimeMS' in event.command
+                or event.command.get('collection') == content_versions_collection.name):
+            return
+        self._pending[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        command = self._pending.pop((event.connection_id, event.request_id), None)
+        if command is None or event.duration_micros < Config.SLOW_QUERY_MS * 1000:
+            return
+        collection = _target(event.command_name, command)
+        shape = command_shape(command)
+        record = {
+            'at': datetime.utcnow(),
+            'command': event.command_name,
+            'database': event.database_name,
+            'collection': collection,
+            'shape': shape,
+            'shape_id': hashlib.sha1(json.dumps(
+                [event.command_name, collection, shape], sort_keys=True, default=str
+            ).encode()).hexdigest()[:12],
+            'duration_ms': round(event.duration_micros / 1000, 2),
+            'endpoint': metrics.current_endpoint.get(),
+            'failed': isinstance(event, monitoring.CommandFailedEvent),
+        }
+        # Explain and storage run off the request thread
+        _executor.submit(_record, record, command)
+
+
+def _explain(record, command):
+    if record['command'] not in EXPLAINABLE:
+        return None
+    with _explained_lock:
+        if record['shape_id'] in _explained:
+            return None
+        _explained.add(record['shape_id'])
+    replay = {k: v for k, v in command.items() if k not in SESSION_FIELDS}
+    try:
+        result = get_client()[record['database']].command(
+            {'explain': replay, 'verbosity': 'queryPlanner'})
+        return result.get('queryPlanner', result)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _record(record, command):
+    plan = _explain(record, command)
+    if plan is not None:
+        record['query_planner'] = plan
+    try:
+        if Config.SLOW_QUERY_STORE == 'file':
+            _get_file_logger().info(json.dumps(record, default=str))
+        else:
+            get_db()[Config.SLOW_QUERY_COLLECTION].insert_one(record)
+    except Exception as e:
+        print(f"❌ Could not store slow query: {e}")
+
+
+def _get_file_logger():
+    global _file_logger
+    if _file_logger is None:
+        os.makedirs(os.path.dirname(Config.SLOW_QUERY_LOG), exist_ok=True)
+        handler = RotatingFileHandler(Config.SLOW_QUERY_LOG, maxBytes=5 * 1024 * 1024, backupCount=3)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _file_logger = logging.getLogger('slow_queries')
+        _file_logger.propagate = False
+        _file_logger.setLevel(logging.INFO)
+        _file_logger.addHandler(handler)
+    return _file_logger
+
+
+def ensure_store():
+    """Create the capped collection if it doesn't exist yet."""
+    if Config.SLOW_QUERY_STORE == 'file':
+        return
+    try:
+        db = get_db()
+        if Config.SLOW_QUERY_COLLECTION not in db.list_collection_names():
+            db.create_collection(Config.SLOW_QUERY_COLLECTION, capped=True,
+                                 size=Config.SLOW_QUERY_CAPPED_BYTES)
+    except Exception as e:
+        print(f"❌ Could not create {Config.SLOW_QUERY_COLLECTION}: {e}")
+
+
+def recent(limit=100):
+    """Most recent slow queries, newest first."""
+    if Config.SLOW_QUERY_STORE == 'file':
+        if not os.path.exists(Config.SLOW_QUERY_LOG):
+            return []
+        with open(Config.SLOW_QUERY_LOG) as f:
+            lines = deque(f, maxlen=limit)
+        return [json.loads(line) for line in reversed(lines)]
+    return get_db()[Config.SLOW_QUERY_COLLECTION].find(
+        {}, {'_id': 0}, sort=[('$natural', -1)], limit=limit)
+
+
+slow_query_listener = SlowQueryListener()
+if Config.SLOW_QUERY_MS > 0:
+    monitoring.register(slow_query_listener)
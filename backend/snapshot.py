@@ -0,0 +1,188 @@
+import fcntl
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from urllib.parse import quote, urlencode
+from config import Config
+from models import blogs_collection, projects_collection
+from routes.pages import PAGE_BUNDLES
+import cache
+import compression
+
+# Static copy of every public GET endpoint for nginx to serve directly:
+#
+#   SNAPSHOT_DIR/versions/<version>/api/home.json (+ .gz, .br)
+#   SNAPSHOT_DIR/versions/<version>/api/projects?category=Branding.json
+#   SNAPSHOT_DIR/current -> versions/<version>
+#
+# A version is complete before `current` is switched to it, so readers never
+# see a half-written snapshot. Each version's manifest.json records which
+# collections every file was built from; after an admin write only the files
+# built from the written collections are rendered again, the rest are
+# hard-linked from the previous version.
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot')
+_pending = set()
+_scheduled = False
+_pending_lock = Lock()
+_build_lock = Lock()
+
+
+def targets():
+    """(url, collections it is cached under) for every snapshotted endpoint."""
+    for name in ('home', 'about', 'services', 'pricing', 'testimonials', 'clients', 'faqs'):
+        yield f'/api/{name}', (name,)
+    yield '/api/contact/faqs', ('faqs',)
+    yield '/api/filters', ('projects',)
+    yield '/api/projects', ('projects',)
+    for category in projects_collection.distinct('category'):
+        yield f"/api/projects?{urlencode({'category': category}, quote_via=quote)}", ('projects',)
+    yield '/api/blogs', ('blogs',)
+    for blog in blogs_collection.find({}, {'_id': 1, 'id': 1}):
+        yield f"/api/blogs/{blog['_id']}", ('blogs',)
+        for key in filter(None, (blog['_id'], blog.get('id'))):
+            yield f"/api/blogs/{key}/related", ('blogs_related',)
+    for project in projects_collection.find({}, {'_id': 1, 'id': 1}):
+        for key in filter(None, (project['_id'], project.get('id'))):
+            yield f"/api/projects/{key}/related", ('projects_related',)
+    for page, sections in PAGE_BUNDLES.items():
+        yield f'/api/pages/{page}', tuple(sections)
+
+
+def file_for(url):
+    """Path of a URL's file inside a version: "<path>[?<query>].json"."""
+    return url.lstrip('/') + '.json'
+
+
+def _current_dir():
+    return os.path.join(Config.SNAPSHOT_DIR, 'current')
+
+
+def _load_manifest():
+    try:
+        with open(os.path.join(_current_dir(), 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, body):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(body)
+    # Precompressed siblings for nginx gzip_static / brotli_static
+    if len(body) >= Config.COMPRESS_MIN_SIZE:
+        with open(path + '.gz', 'wb') as f:
+            f.write(compression.compress(body, 'gzip', best=True))
+        if compression.brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(compression.compress(body, 'br', best=True))
+
+
+def _link(old_path, new_path):
+    os.makedirs(os.path.dirname(new_path), exist_ok=True)
+    for suffix in ('', '.gz', '.br'):
+        if os.path.exists(old_path + suffix):
+            os.link(old_path + suffix, new_path + suffix)
+
+
+def _swap(version):
+    link = _current_dir()
+    tmp = f'{link}.tmp-{os.getpid()}'
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(os.path.join('versions', version), tmp)
+    os.replace(tmp, link)  # atomic: readers see the old or the new version
+
+
+def _prune(keep):
+    versions_dir = os.path.join(Config.SNAPSHOT_DIR, 'versions')
+    current = os.path.basename(os.path.realpath(_current_dir()))
+    for version in sorted(os.listdir(versions_dir))[:-keep]:
+        if version != current:
+            shutil.rmtree(os.path.join(versions_dir, version), ignore_errors=True)
+
+
+def build(affected=None):
+    """Write a new snapshot version and make it current.
+
+    With `affected` (collection names) only files built from those collections
+    are rendered again. Returns the new version, or None if nothing changed.
+    """
+    from app import app  # the snapshot renders through the real routes
+
+    os.makedirs(os.path.join(Config.SNAPSHOT_DIR, 'versions'), exist_ok=True)
+    with _build_lock, open(os.path.join(Config.SNAPSHOT_DIR, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # one builder across workers
+
+        previous = _load_manifest() if affected is not None else None
+        old_files = (previous or {}).get('files', {})
+        version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+        version_dir = os.path.join(Config.SNAPSHOT_DIR, 'versions', version)
+        client = app.test_client()
+        files = {}
+        changed = previous is None
+
+        for url, collections in targets():
+            path = os.path.join(version_dir, file_for(url))
+            old = old_files.get(url)
+            if old is not None and not set(collections) & set(affected):
+                _link(os.path.join(_current_dir(), old['file']), path)
+            else:
+                response = client.get(url)
+                if response.status_code != 200:
+                    continue  # not in the snapshot; nginx falls through to the app
+                _write(path, response.get_data())
+                changed = True
+            files[url] = {'file': file_for(url), 'collections': list(collections)}
+
+        if not changed and files.keys() == old_files.keys():
+            shutil.rmtree(version_dir, ignore_errors=True)
+            return None
+
+        with open(os.path.join(version_dir, 'manifest.json'), 'w') as f:
+            json.dump({'version': version, 'created_at': time.time(), 'files': files}, f, indent=2)
+        _swap(version)
+        _prune(Config.SNAPSHOT_KEEP)
+        return version
+
+
+def _run_pending():
+    global _scheduled
+    while True:
+        time.sleep(Config.SNAPSHOT_DEBOUNCE_MS / 1000)  # let a burst of writes land first
+        with _pending_lock:
+            affected = set(_pending)
+            _pending.clear()
+            if not affected:
+                _scheduled = False
+                return
+        try:
+            build(affected)
+        except Exception as e:
+            print(f"❌ Snapshot update failed: {e}")
+
+
+def schedule(collections):
+    """Queue a partial rebuild for `collections` (registered with cache.on_invalidate)."""
+    global _scheduled
+    with _pending_lock:
+        _pending.update(collections)
+        if _scheduled:
+            return
+        _scheduled = True
+    _executor.submit(_run_pending)
+
+
+if Config.SNAPSHOT_ON_WRITE:
+    cache.on_invalidate(schedule)
+
+
+if __name__ == '__main__':
+    # python snapshot.py  -- full export
+    version = build()
+    print(f"✅ Snapshot {version} written to {os.path.join(Config.SNAPSHOT_DIR, 'current')}")
@@ -0,0 +1,47 @@
+"""Shared setup for the mongomock-backed tests.
+
+Import it before any backend module: it puts backend/ on sys.path, pins the
+settings the tests rely on and points db.py's shared client at an in-memory
+mongomock database, the same way benchmarks/bench_endpoints.py does.
+"""
+import os
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
+
+# Read by config.py at import time
+os.environ.update({
+    'MONGODB_DBNAME': 'elve_test',
+    'CONTENT_VERSIONS_MODE': 'off',
+    'SLOW_QUERY_MS': '0',
+    'SNAPSHOT_ON_WRITE': '0',
+    'JWT_SECRET': 'test-secret-long-enough-for-hs256-keys',
+})
+
+import mongomock  # noqa: E402
+import db  # noqa: E402
+
+db._client = mongomock.MongoClient()
+db._pid = os.getpid()
+
+
+def _ignore_sort(add):
+    def wrapper(self, *args, sort=None, **kwargs):
+        return add(self, *args, **kwargs)
+    return wrapper
+
+
+# pymongo >= 4.11 passes sort= to the bulk_write builders, which mongomock
+# doesn't accept yet; the backend never sets it
+_builder = mongomock.collection.BulkOperationBuilder
+_builder.add_replace = _ignore_sort(_builder.add_replace)
+_builder.add_update = _ignore_sort(_builder.add_update)
+
+
+def reset_database():
+    """Drop every collection, so each test starts from an empty database."""
+    database = db.get_db()
+    for name in database.list_collection_names():
+        database.drop_collection(name)
@@ -0,0 +1,118 @@
+import itertools
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import support
+import jwt
+from app import app
+from config import Config
+from models import revoked_tokens_collection
+import auth
+
+# Tokens issued in the same second for the same subject are identical
+_subjects = itertools.count()
+
+
+def _token():
+    return auth.issue_token(f'admin-{next(_subjects)}')
+
+
+class AuthTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        auth._verified.clear()
+        self.client = app.test_client()
+
+    def _verify(self, token):
+        return self.client.get('/api/admin/verify', headers={'Authorization': f'Bearer {token}'})
+
+    def _logout(self, token):
+        return self.client.post('/api/admin/logout', headers={'Authorization': f'Bearer {token}'})
+
+    def test_login_issues_a_working_token(self):
+        response = self.client.post('/api/admin/login', json={'username': 'admin', 'password': 'adminpassword'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._verify(response.get_json()['token']).status_code, 200)
+
+        response = self.client.post('/api/admin/login', json={'username': 'admin', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_the_token(self):
+        token, other = _token(), _token()
+        self.assertEqual(self._verify(token).status_code, 200)
+        self.assertEqual(self._verify(other).status_code, 200)
+
+        self.assertEqual(self._logout(token).status_code, 200)
+        response = self._verify(token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json(), {'error': 'Invalid token'})
+        self.assertIsNotNone(revoked_tokens_collection.find_one({'_id': auth._digest(token)}))
+        # Only that token
+        self.assertEqual(self._verify(other).status_code, 200)
+
+    def test_revocation_by_another_worker_reaches_cached_tokens(self):
+        # CONTENT_VERSIONS_MODE=off: nothing is announced, so the cache hit
+        # still checks revoked_tokens
+        token = _token()
+        self.assertEqual(self._verify(token).status_code, 200)
+        self.assertIn(auth._digest(token), auth._verified)
+
+        revoked_tokens_collection.insert_one({
+            '_id': auth._digest(token),
+            'expires_at': datetime.utcnow() + timedelta(hours=1)
+        })
+        self.assertEqual(self._verify(token).status_code, 401)
+        self.assertNotIn(auth._digest(token), auth._verified)
+
+    def test_announced_revocation_clears_the_cache(self):
+        token = _token()
+        auth.verify(token)
+        auth._on_change({auth.REVOKED}, baseline=True)
+        self.assertIn(auth._digest(token), auth._verified)
+        auth._on_change({auth.REVOKED}, baseline=False)
+        self.assertEqual(len(auth._verified), 0)
+
+    def test_admin_token_cannot_be_revoked(self):
+        with mock.patch.object(Config, 'ADMIN_TOKEN', 'static-admin-token'):
+            self.assertEqual(self._verify('static-admin-token').status_code, 200)
+            response = self._logout('static-admin-token')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('ADMIN_TOKEN', response.get_json()['error'])
+            self.assertEqual(self._verify('static-admin-token').status_code, 200)
+            self.assertEqual(revoked_tokens_collection.count_documents({}), 0)
+
+            with self.assertRaises(ValueError):
+                auth.revoke('static-admin-token')
+
+        # Unset, it is just a bad token
+        self.assertEqual(self._verify('static-admin-token').status_code, 401)
+
+    def test_bad_and_expired_tokens(self):
+        self.assertEqual(self.client.get('/api/admin/verify').status_code, 401)
+        self.assertEqual(self._verify('not-a-jwt').status_code, 401)
+
+        forged = jwt.encode({'sub': 'admin', 'exp': datetime.utcnow() + timedelta(hours=1)},
+                            'some-other-secret-long-enough-for-hs256', algorithm='HS256')
+        self.assertEqual(self._verify(forged).status_code, 401)
+
+        expired = jwt.encode({'sub': 'admin', 'exp': datetime.utcnow() - timedelta(seconds=5)},
+                             Config.JWT_SECRET, algorithm='HS256')
+        response = self._verify(expired)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json(), {'error': 'Token expired'})
+
+    def test_cached_token_expires(self):
+        token = _token()
+        auth.verify(token)
+        digest = auth._digest(token)
+        claims = auth._verified[digest][1]
+        auth._verified[digest] = (0, claims)
+        # The stale entry is dropped and the token verified again
+        self.assertEqual(auth.verify(token), claims)
+        self.assertGreater(auth._verified[digest][0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import gzip
+import unittest
+from unittest import mock
+
+import support
+from app import app
+from models import faqs_collection
+import assets
+import cache
+import compression
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        cache.clear()
+        faqs_collection.insert_one({'id': 1, 'question': 'Do you build apps?', 'answer': 'Yes'})
+        self.client = app.test_client()
+
+    def test_etag_and_304(self):
+        response = self.client.get('/api/faqs')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        etag = response.headers['ETag']
+
+        response = self.client.get('/api/faqs', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_write_changes_the_etag_and_body(self):
+        etag = self.client.get('/api/faqs').headers['ETag']
+        faqs_collection.insert_one({'id': 2, 'question': 'Do you design logos?', 'answer': 'Yes'})
+        cache.invalidate('faqs')
+
+        response = self.client.get('/api/faqs', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(response.get_json()), 2)
+
+    def test_unrelated_write_keeps_the_etag(self):
+        etag = self.client.get('/api/faqs').headers['ETag']
+        cache.invalidate('blogs')
+        response = self.client.get('/api/faqs', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_body_is_served_from_the_cache(self):
+        first = self.client.get('/api/faqs').data
+        with mock.patch.object(faqs_collection, 'find', side_effect=AssertionError('view ran')):
+            self.assertEqual(self.client.get('/api/faqs').data, first)
+
+    def test_bundle_etag_follows_each_section(self):
+        etag = self.client.get('/api/pages/services').headers['ETag']
+        cache.invalidate('testimonials')
+        response = self.client.get('/api/pages/services', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_gzip_body_has_its_own_etag(self):
+        faqs_collection.insert_many([{'id': i, 'question': f'Question {i}?', 'answer': 'An answer ' * 20}
+                                     for i in range(2, 20)])
+        plain = self.client.get('/api/faqs', headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('Accept-Encoding', plain.headers['Vary'])
+
+        with mock.patch.object(compression, 'brotli', None):
+            zipped = self.client.get('/api/faqs', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(zipped.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(zipped.headers['ETag'], plain.headers['ETag'][:-1] + '-gzip"')
+        self.assertEqual(gzip.decompress(zipped.data), plain.data)
+        # The compressed body is kept with the cached entry
+        entry = next(iter(cache._entries.values()))
+        self.assertEqual(entry['encoded']['gzip'], zipped.data)
+
+        # Either tag still names the current version
+        for etag in (plain.headers['ETag'], zipped.headers['ETag']):
+            response = self.client.get('/api/faqs', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+
+    def test_small_body_is_not_compressed(self):
+        response = self.client.get('/api/faqs', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertFalse(response.headers['ETag'].endswith('-gzip"'))
+
+    def test_new_asset_manifest_changes_the_etag(self):
+        etag = self.client.get('/api/faqs').headers['ETag']
+        with mock.patch.object(assets, '_digest', 'deployed'):
+            response = self.client.get('/api/faqs', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Change-stream coherence between two processes, against a real replica set.
+
+    cd backend && python -m unittest discover -s tests
+
+Uses MONGODB_URI (default mongodb://localhost:27017) and a throwaway
+database. Skipped unless the server is a replica set member, e.g.
+`mongod --replSet rs0` followed by `mongosh --eval "rs.initiate()"`.
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import uuid
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URI = os.getenv('MONGODB_URI') or os.getenv('MONGO_URI') or 'mongodb://localhost:27017'
+TIMEOUT = 15
+
+# A worker with a cached /api/faqs response, reporting every coherence sync
+# as "<baseline|changed> <etag> <entry still cached>". slow_queries is
+# imported first so its listener sees the change stream's getMores.
+FOLLOWER = '''
+import time
+import slow_queries
+import cache
+import coherence
+
+KEY, FAQS = ('/api/faqs', ()), ('faqs',)
+
+def report(changed, baseline):
+    versions, entry = cache.lookup(KEY, FAQS)
+    print('baseline' if baseline else 'changed', cache.etag_for(versions), entry is not None, flush=True)
+
+coherence.on_change(report)
+mode = coherence.start()
+cache.store(KEY, FAQS, cache.lookup(KEY, FAQS)[0], b'[]', 'application/json', [])
+print('ready', mode, cache.lookup(KEY, FAQS)[1] is not None, flush=True)
+while True:
+    time.sleep(1)
+'''
+
+# Another worker saving a FAQ
+WRITER = '''
+import cache
+cache.invalidate('faqs')
+'''
+
+
+class ChangeStreamCoherenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            hello = MongoClient(URI, serverSelectionTimeoutMS=1000).admin.command('hello')
+        except PyMongoError as e:
+            raise unittest.SkipTest(f'MongoDB not reachable at {URI}: {e}')
+        if 'setName' not in hello:
+            raise unittest.SkipTest(f'{URI} is not a replica set; change streams need one')
+
+    def setUp(self):
+        self.dbname = f'elve_coherence_test_{uuid.uuid4().hex[:8]}'
+        self.env = dict(os.environ, MONGODB_URI=URI, MONGODB_DBNAME=self.dbname,
+                        CONTENT_VERSIONS_MODE='stream', CONTENT_VERSIONS_POLL_MS='200',
+                        SLOW_QUERY_MS='100', SLOW_QUERY_STORE='mongo')
+        self.follower = subprocess.Popen([sys.executable, '-c', FOLLOWER], cwd=BACKEND,
+                                         env=self.env, stdout=subprocess.PIPE, text=True)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def tearDown(self):
+        self.follower.kill()
+        self.follower.wait()
+        self.follower.stdout.close()
+        MongoClient(URI).drop_database(self.dbname)
+
+    def _read(self):
+        for line in self.follower.stdout:
+            self.lines.put(line.split())
+
+    def _next(self):
+        try:
+            return self.lines.get(timeout=TIMEOUT)
+        except queue.Empty:
+            self.fail('follower printed nothing')
+
+    def test_write_in_one_worker_invalidates_the_other(self):
+        event, etag, cached = self._next()
+        self.assertEqual(event, 'baseline')
+        self.assertTrue(etag.endswith('-0'))
+        self.assertEqual(self._next(), ['ready', 'stream', 'True'])
+
+        subprocess.run([sys.executable, '-c', WRITER], cwd=BACKEND, env=self.env,
+                       check=True, timeout=TIMEOUT)
+
+        event, new_etag, cached = self._next()
+        self.assertEqual(event, 'changed')
+        self.assertEqual(new_etag, etag[:-len('0')] + '1')
+        self.assertEqual(cached, 'False')
+
+    def test_waiting_stream_is_not_a_slow_query(self):
+        # Each getMore waits CONTENT_VERSIONS_POLL_MS (200), over SLOW_QUERY_MS (100)
+        self.assertEqual(self._next()[0], 'baseline')
+        self.assertEqual(self._next()[:2], ['ready', 'stream'])
+        time.sleep(1.5)
+        self.assertEqual(MongoClient(URI)[self.dbname]['slow_queries'].count_documents({}), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
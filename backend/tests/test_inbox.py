@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime
+
+import support
+from app import app
+from models import ContactMessage, contact_messages_collection
+import auth
+import inbox
+
+
+class InboxTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        self.client = app.test_client()
+        self.headers = {'Authorization': f'Bearer {auth.issue_token("inbox-test")}'}
+        # created_at as the model stores it, as a datetime (older data) or missing
+        for i in range(11):
+            doc = ContactMessage(f'Visitor {i}', 'v@example.com', '', 'Hi').to_dict()
+            if i % 3 == 1:
+                doc['created_at'] = datetime.utcnow()
+            elif i % 3 == 2:
+                del doc['created_at']
+            doc['read'] = i % 2 == 0
+            contact_messages_collection.insert_one(doc)
+        inbox.recount()
+
+    def _pages(self, status, limit=3):
+        names, cursor, pages = [], None, 0
+        while True:
+            url = f'/api/admin/contact-messages?status={status}&limit={limit}'
+            if cursor:
+                url += f'&cursor={cursor}'
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            names += [message['full_name'] for message in response.get_json()]
+            pages += 1
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                return names, pages
+
+    def _unread(self):
+        response = self.client.get('/api/admin/contact-messages/unread-count', headers=self.headers)
+        return response.get_json()['unread']
+
+    def test_pages_cover_every_message_once_newest_first(self):
+        names, pages = self._pages('all')
+        self.assertEqual(names, [f'Visitor {i}' for i in reversed(range(11))])
+        self.assertEqual(pages, 4)
+
+    def test_status_filters(self):
+        self.assertEqual(self._pages('unread')[0], [f'Visitor {i}' for i in (9, 7, 5, 3, 1)])
+        self.assertEqual(len(self._pages('read')[0]), 6)
+        response = self.client.get('/api/admin/contact-messages?status=spam', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor_is_400(self):
+        response = self.client.get('/api/admin/contact-messages?cursor=not-a-cursor', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_unread_counter_follows_every_change(self):
+        self.assertEqual(self._unread(), 5)
+        unread = contact_messages_collection.find_one({'read': False})
+        read = contact_messages_collection.find_one({'read': True})
+
+        self.client.put(f'/api/admin/contact-messages/{unread["_id"]}', json={'read': True},
+                        headers=self.headers)
+        self.assertEqual(self._unread(), 4)
+        # Marking a read message read again changes nothing
+        self.client.put(f'/api/admin/contact-messages/{read["_id"]}', json={'read': True},
+                        headers=self.headers)
+        self.assertEqual(self._unread(), 4)
+
+        victim = contact_messages_collection.find_one({'read': False})
+        self.client.delete(f'/api/admin/contact-messages/{victim["_id"]}', headers=self.headers)
+        self.assertEqual(self._unread(), 3)
+
+        inbox.adjust(2)  # what ingest reports after writing two new messages
+        self.assertEqual(self._unread(), 5)
+
+        response = self.client.put('/api/admin/contact-messages/mark-all-read', headers=self.headers)
+        self.assertEqual(response.get_json()['updated'], 3)
+        self.assertEqual(self._unread(), 2)
+        self.assertEqual(inbox.recount(), 0)
+
+    def test_missing_counter_is_rebuilt(self):
+        support.reset_database()
+        contact_messages_collection.insert_one({'full_name': 'New', 'read': False})
+        self.assertEqual(self._unread(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import glob
+import os
+import queue
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import support
+from bson import ObjectId
+from app import app
+from config import Config
+from models import contact_messages_collection, submitted_questions_collection
+import ingest
+
+CONTACT = {'full_name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello'}
+
+
+def _wait_for(count, collection, timeout=5):
+    deadline = time.monotonic() + timeout
+    while collection.count_documents({}) < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return collection.count_documents({})
+
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        spill_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spill_dir)
+        for name, value in (('RATE_LIMIT_ENABLED', False), ('INGEST_SPILL_DIR', spill_dir)):
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def _spill_files(self):
+        return glob.glob(os.path.join(Config.INGEST_SPILL_DIR, '*'))
+
+    def test_submission_is_accepted_then_written(self):
+        response = self.client.post('/api/contact', json=CONTACT)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(_wait_for(1, contact_messages_collection), 1)
+        message = contact_messages_collection.find_one()
+        self.assertEqual(str(message['_id']), response.get_json()['id'])
+        self.assertIs(message['read'], False)
+
+    def test_questions_get_integer_ids_per_batch(self):
+        for i in range(3):
+            response = self.client.post('/api/submit-question', json={'question': f'Q{i}?'})
+            self.assertEqual(response.status_code, 202)
+        self.assertEqual(_wait_for(3, submitted_questions_collection), 3)
+        self.assertEqual(sorted(submitted_questions_collection.distinct('id')), [1, 2, 3])
+
+    def test_invalid_submission_is_not_queued(self):
+        response = self.client.post('/api/contact', json={'full_name': 'Ada'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_full_queue_answers_503(self):
+        ingest._ensure_started()
+        full = queue.Queue(maxsize=1)
+        full.put(('contact_messages', {}))
+        with mock.patch.object(ingest, '_queue', full):
+            response = self.client.post('/api/contact', json=CONTACT)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], str(Config.INGEST_RETRY_AFTER))
+
+    def test_failed_batch_is_spilled_and_replayed(self):
+        docs = [{'_id': ObjectId(), 'full_name': f'Visitor {i}', 'read': False} for i in range(3)]
+        with mock.patch.object(ingest, '_insert', side_effect=ConnectionError('down')):
+            ingest._flush([('contact_messages', dict(doc)) for doc in docs])
+        self.assertEqual(contact_messages_collection.count_documents({}), 0)
+        self.assertEqual(len(self._spill_files()), 1)
+
+        # One of them made it in before the failure; replay skips the duplicate
+        contact_messages_collection.insert_one(dict(docs[0]))
+        ingest.replay()
+        self.assertEqual(sorted(contact_messages_collection.distinct('_id')),
+                         sorted(doc['_id'] for doc in docs))
+        self.assertEqual(self._spill_files(), [])
+
+    def test_next_good_batch_replays_the_spill(self):
+        with mock.patch.object(ingest, '_insert', side_effect=ConnectionError('down')):
+            ingest._flush([('contact_messages', {'_id': ObjectId(), 'full_name': 'Spilled'})])
+        ingest._flush([('contact_messages', {'_id': ObjectId(), 'full_name': 'Fresh'})])
+        self.assertEqual(sorted(contact_messages_collection.distinct('full_name')), ['Fresh', 'Spilled'])
+        self.assertEqual(self._spill_files(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import support
+from flask import Flask
+from app import app
+from config import Config
+import ratelimit
+
+INVALID = {'full_name': 'Ada'}  # rejected with 400 after the limit check, so nothing is queued
+
+
+class RateLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        patcher = mock.patch.object(ratelimit, '_memory', ratelimit.MemoryBuckets(100))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def _post(self, ip, **kwargs):
+        return self.client.post('/api/contact', json=INVALID, environ_base={'REMOTE_ADDR': ip}, **kwargs)
+
+    def test_client_over_its_budget_gets_429(self):
+        statuses = [self._post('203.0.113.1').status_code for _ in range(6)]
+        self.assertEqual(statuses, [400] * 5 + [429])
+        response = self._post('203.0.113.1')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '12')  # one token per 60 / 5 s
+        # Other clients keep their own budget
+        self.assertEqual(self._post('203.0.113.2').status_code, 400)
+
+    def test_forwarded_address_only_with_trusted_proxies(self):
+        for i in range(6):
+            response = self._post('10.0.0.1', headers={'X-Forwarded-For': f'198.51.100.{i}'})
+        self.assertEqual(response.status_code, 429)
+
+        with mock.patch.object(Config, 'RATE_LIMIT_TRUSTED_PROXIES', 1):
+            statuses = {self._post('10.0.0.1', headers={'X-Forwarded-For': f'198.51.100.{i}'}).status_code
+                        for i in range(6)}
+        self.assertEqual(statuses, {400})
+
+    def test_disabled(self):
+        with mock.patch.object(Config, 'RATE_LIMIT_ENABLED', False):
+            statuses = {self._post('203.0.113.1').status_code for _ in range(10)}
+        self.assertEqual(statuses, {400})
+
+    def test_global_budget_sheds_with_503(self):
+        shed = Flask(__name__)
+
+        @shed.route('/ping', methods=['POST'])
+        @ratelimit.rate_limit(per_ip='10/minute', total='2/minute')
+        def ping():
+            return 'ok'
+
+        client = shed.test_client()
+        statuses = [client.post('/ping', environ_base={'REMOTE_ADDR': f'203.0.113.{i}'}).status_code
+                    for i in range(3)]
+        self.assertEqual(statuses, [200, 200, 503])
+
+
+class MemoryBucketsTest(unittest.TestCase):
+
+    def test_refills_evenly_up_to_capacity(self):
+        buckets = ratelimit.MemoryBuckets(10)
+        capacity, rate = ratelimit.parse_rate('2/second')
+        with mock.patch('ratelimit.time.monotonic', return_value=100.0):
+            self.assertEqual([buckets.take('k', capacity, rate)[0] for _ in range(3)], [True, True, False])
+        with mock.patch('ratelimit.time.monotonic', return_value=100.5):
+            self.assertEqual([buckets.take('k', capacity, rate)[0] for _ in range(2)], [True, False])
+        with mock.patch('ratelimit.time.monotonic', return_value=200.0):
+            self.assertEqual([buckets.take('k', capacity, rate)[0] for _ in range(3)], [True, True, False])
+
+    def test_forgets_least_recent_clients(self):
+        buckets = ratelimit.MemoryBuckets(2)
+        for key in ('a', 'b', 'c'):
+            buckets.take(key, 1, 1)
+        self.assertEqual(list(buckets._buckets), ['b', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
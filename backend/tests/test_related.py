@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+import support
+from config import Config
+from models import blogs_collection, related_collection
+import related
+
+BLOGS = [
+    {'id': 1, 'title': 'React hooks in depth', 'description': 'State and effects', 'category': 'Web'},
+    {'id': 2, 'title': 'React performance', 'description': 'Memo and effects', 'category': 'Web'},
+    {'id': 3, 'title': 'Kotlin coroutines', 'description': 'Async on Android', 'category': 'Mobile'},
+    {'id': 4, 'title': 'Swift concurrency', 'description': 'Async on iOS', 'category': 'Mobile'},
+]
+
+
+class RelatedTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        blogs_collection.insert_many([dict(blog) for blog in BLOGS])
+        related.rebuild('blogs')
+
+    def _titles(self, item):
+        return [row['title'] for row in related.lookup('blogs', str(item))]
+
+    def test_neighbours_rank_by_similarity(self):
+        self.assertEqual(self._titles(1)[0], 'React performance')
+        self.assertEqual(self._titles(3)[0], 'Swift concurrency')
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(related.lookup('blogs', '1', '-1')), 1)
+        items = list(range(Config.RELATED_TOP_K))
+        self.assertEqual(related.limited(items, '0'), items[:1])
+        self.assertEqual(related.limited(items, '2'), items[:2])
+        self.assertEqual(related.limited(items, '1000'), items)
+        self.assertEqual(related.limited(items, 'abc'), items)
+
+    def test_burst_of_writes_is_one_pass(self):
+        blogs_collection.insert_one({'id': 5, 'title': 'Android coroutines', 'description': 'Kotlin',
+                                     'category': 'Mobile'})
+        blogs_collection.delete_one({'id': 4})
+        with mock.patch.object(related, '_load', wraps=related._load) as load:
+            futures = {related.refresh('blogs', {'id': 5}), related.refresh('blogs', {'id': 4})}
+            self.assertEqual(len(futures), 1)
+            futures.pop().result()
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(self._titles(5)[0], 'Kotlin coroutines')
+        self.assertIsNone(related_collection.find_one({'collection': 'blogs', 'id': 4}))
+        self.assertNotIn('Swift concurrency', self._titles(3))
+
+    def test_unkeyed_write_becomes_a_rebuild(self):
+        with mock.patch.object(related, 'rebuild') as rebuild, \
+                mock.patch.object(related, '_update') as update:
+            related.refresh('blogs', {'id': 1})
+            related.refresh('blogs').result()
+        rebuild.assert_called_once_with('blogs')
+        update.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
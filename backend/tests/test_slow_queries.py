@@ -0,0 +1,80 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import support
+from config import Config
+from db import get_db
+import slow_queries
+
+
+def _event(command_name, command, duration_ms, request_id=1):
+    return SimpleNamespace(command_name=command_name, command=command, connection_id=('db', 27017),
+                           request_id=request_id, database_name='elve_test',
+                           duration_micros=duration_ms * 1000)
+
+
+class SlowQueryListenerTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+        patcher = mock.patch.object(Config, 'SLOW_QUERY_MS', 100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.listener = slow_queries.SlowQueryListener()
+
+    def _run(self, command_name, command, duration_ms):
+        event = _event(command_name, command, duration_ms)
+        self.listener.started(event)
+        self.listener.succeeded(event)
+        # The single storage thread has finished once this returns
+        slow_queries._executor.submit(lambda: None).result()
+        return list(get_db()[Config.SLOW_QUERY_COLLECTION].find())
+
+    def test_slow_find_is_recorded_with_redacted_filter(self):
+        records = self._run('find', {'find': 'blogs', 'filter': {'id': 7}, 'sort': {'_id': -1}}, 250)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['collection'], 'blogs')
+        self.assertEqual(records[0]['shape'], {'filter': {'id': '?'}, 'sort': {'_id': -1}})
+
+    def test_fast_command_is_ignored(self):
+        self.assertEqual(self._run('find', {'find': 'blogs', 'filter': {}}, 5), [])
+
+    def test_storing_a_record_is_never_recorded(self):
+        command = {'insert': Config.SLOW_QUERY_COLLECTION, 'documents': [{'at': 1}]}
+        self.assertEqual(self._run('insert', command, 500), [])
+        self.assertEqual(self.listener._pending, {})
+
+    def test_awaiting_getmore_is_not_recorded(self):
+        change_stream = {'getMore': 42, 'collection': 'content_versions', 'maxTimeMS': 1000}
+        self.assertEqual(self._run('getMore', change_stream, 1000), [])
+        tailable = {'getMore': 43, 'collection': 'oplog', 'maxTimeMS': 1000}
+        self.assertEqual(self._run('getMore', tailable, 1000), [])
+
+    def test_slow_getmore_names_its_collection(self):
+        records = self._run('getMore', {'getMore': 44, 'collection': 'blogs'}, 250)
+        self.assertEqual([record['collection'] for record in records], ['blogs'])
+
+    def test_explain_replays_are_never_recorded(self):
+        command = {'explain': {'find': 'blogs', 'filter': {}}, 'verbosity': 'queryPlanner'}
+        self.assertEqual(self._run('explain', command, 500), [])
+
+
+class RedactTest(unittest.TestCase):
+
+    def test_numbers_in_filters_and_updates_are_replaced(self):
+        shape = slow_queries.command_shape({
+            'findAndModify': 'counters', 'query': {'_id': 1}, 'sort': {'a': 1},
+            'update': {'$inc': {'count': -1}}})
+        self.assertEqual(shape, {'sort': {'a': 1}, 'query': {'_id': '?'},
+                                 'update': {'$inc': {'count': '?'}}})
+
+    def test_pipeline_keeps_sort_and_project_flags_only(self):
+        shape = slow_queries.command_shape({'aggregate': 'blogs', 'pipeline': [
+            {'$match': {'views': 1}}, {'$sort': {'views': -1}}, {'$project': {'_id': 0}}, {'$limit': 1}]})
+        self.assertEqual(shape['pipeline'], [{'$match': {'views': '?'}}, {'$sort': {'views': -1}},
+                                             {'$project': {'_id': 0}}, {'$limit': '?'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime
+
+import support
+from bson import ObjectId
+from models import blogs_collection, contact_messages_collection
+import inbox
+import transfer
+
+BLOGS = [
+    {'id': 1, 'title': 'Launching our new site', 'date': datetime(2024, 5, 1)},
+    {'id': 2, 'title': 'Design systems', 'date': datetime(2024, 6, 1)},
+]
+
+
+class TransferTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_database()
+
+    def _export(self, name):
+        return ''.join(transfer.export_lines(name)).splitlines()
+
+    def test_round_trip_keeps_ids_and_types(self):
+        blogs_collection.insert_many([dict(blog) for blog in BLOGS])
+        originals = list(blogs_collection.find().sort('_id', 1))
+        lines = self._export('blogs')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"$oid"', lines[0])
+
+        blogs_collection.delete_many({})
+        result = transfer.import_lines('blogs', lines)
+        self.assertEqual((result['upserted'], result['failed']), (2, 0))
+        self.assertEqual(list(blogs_collection.find().sort('_id', 1)), originals)
+
+    def test_reimport_updates_by_id(self):
+        blogs_collection.insert_many([dict(blog) for blog in BLOGS])
+        lines = self._export('blogs')
+        blogs_collection.update_one({'id': 1}, {'$set': {'title': 'Changed'}})
+        result = transfer.import_lines('blogs', lines)
+        self.assertEqual((result['matched'], result['upserted']), (2, 0))
+        self.assertEqual(blogs_collection.find_one({'id': 1})['title'], 'Launching our new site')
+        self.assertEqual(blogs_collection.count_documents({}), 2)
+
+    def test_bad_lines_are_reported_and_the_rest_imported(self):
+        lines = [
+            '{"id": 1, "title": "ok"}',
+            '{not json',
+            '',
+            '[1, 2]',
+            '{"_id": {"$oid": "zz"}, "title": "bad id"}',
+            b'{"id": 2, "title": "bytes line"}',
+        ]
+        result = transfer.import_lines('blogs', lines)
+        self.assertEqual(result['failed'], 3)
+        self.assertEqual(result['upserted'], 2)
+        self.assertEqual([error['line'] for error in result['batches'][0]['errors']], [2, 4, 5])
+        self.assertEqual(sorted(blogs_collection.distinct('id')), [1, 2])
+
+    def test_imported_messages_recount_unread(self):
+        lines = ['{"_id": {"$oid": "%s"}, "full_name": "A", "read": %s}' % (ObjectId(), read)
+                 for read in ('false', 'true', 'false')]
+        transfer.import_lines('contact_messages', lines)
+        self.assertEqual(contact_messages_collection.count_documents({}), 3)
+        self.assertEqual(inbox.unread_count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
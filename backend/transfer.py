@@ -0,0 +1,119 @@
+import itertools
+from bson import json_util
+from bson.errors import BSONError
+from pymongo import InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from config import Config
+from db import get_db
+from cache import invalidate
+from sequences import sync_counter
+import inbox
+import search
+import related
+
+# NDJSON bulk export / import for moving content between environments: one
+# document per line in MongoDB relaxed Extended JSON, so ObjectIds and dates
+# survive the round trip ({"_id": {"$oid": "..."}}). Both directions work a
+# batch at a time, so memory use doesn't grow with the collection.
+
+# Collections that hold content; derived ones (counters, related_content, ...)
+# are rebuilt from these.
+COLLECTIONS = ('home', 'about', 'services', 'projects', 'pricing', 'testimonials',
+               'clients', 'faqs', 'blogs', 'contact_messages', 'submitted_questions')
+
+# Errors reported per batch; the rest are only counted
+MAX_ERRORS = 10
+
+
+def export_lines(name):
+    """Yield collection `name` as NDJSON, TRANSFER_BATCH_SIZE documents per chunk."""
+    size = Config.TRANSFER_BATCH_SIZE
+    cursor = get_db()[name].find({}, batch_size=size).sort('_id', 1)
+    try:
+        while True:
+            docs = list(itertools.islice(cursor, size))
+            if not docs:
+                return
+            yield ''.join(json_util.dumps(doc) + '\n' for doc in docs)
+    finally:
+        cursor.close()
+
+
+def _operation(doc):
+    if 'id' in doc:
+        # Keyed by the integer id; an existing document keeps its own _id
+        update = {'$set': {k: v for k, v in doc.items() if k != '_id'}}
+        if '_id' in doc:
+            update['$setOnInsert'] = {'_id': doc['_id']}
+        return UpdateOne({'id': doc['id']}, update, upsert=True)
+    if '_id' in doc:
+        return ReplaceOne({'_id': doc['_id']}, doc, upsert=True)
+    return InsertOne(doc)
+
+
+def _write(collection, number, operations, lines, errors, failed):
+    result = {'batch': number, 'lines': [lines[0], lines[-1]] if lines else None,
+              'inserted': 0, 'upserted': 0, 'matched': 0, 'modified': 0}
+    if operations:
+        try:
+            details = collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            for error in details['writeErrors']:
+                failed += 1
+                if len(errors) < MAX_ERRORS:
+                    errors.append({'line': lines[error['index']], 'error': error['errmsg']})
+        result.update(inserted=details['nInserted'], upserted=details['nUpserted'],
+                      matched=details['nMatched'], modified=details['nModified'])
+    result.update(failed=failed, errors=errors)
+    return result
+
+
+def import_lines(name, lines):
+    """Upsert NDJSON `lines` (str or bytes) into `name`.
+
+    Documents with an integer `id` are matched on it, others on `_id`, and
+    documents with neither are inserted. Writes go out in unordered batches
+    of TRANSFER_BATCH_SIZE; returns one result per batch.
+    """
+    collection = get_db()[name]
+    size = Config.TRANSFER_BATCH_SIZE
+    batches = []
+    operations, numbers, errors, failed = [], [], [], 0
+    has_ids = False
+
+    for number, line in enumerate(lines, 1):
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            doc = json_util.loads(line)
+            if not isinstance(doc, dict):
+                raise ValueError('expected a JSON object')
+            operations.append(_operation(doc))
+            numbers.append(number)
+            has_ids = has_ids or 'id' in doc
+        # Bad JSON, or Extended JSON that doesn't convert ({"$oid": "zz"}, ...)
+        except (ValueError, TypeError, BSONError) as e:
+            failed += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append({'line': number, 'error': str(e)})
+        if len(operations) + failed >= size:
+            batches.append(_write(collection, len(batches) + 1, operations, numbers, errors, failed))
+            operations, numbers, errors, failed = [], [], [], 0
+    if operations or failed:
+        batches.append(_write(collection, len(batches) + 1, operations, numbers, errors, failed))
+
+    # Imported ids must not be handed out again by allocate_id()
+    if has_ids:
+        sync_counter(collection)
+    if name == 'contact_messages':
+        inbox.recount()  # imported messages keep their read flag
+    invalidate(name)
+    search.refresh(name)
+    related.refresh(name)
+
+    totals = {key: sum(batch[key] for batch in batches)
+              for key in ('inserted', 'upserted', 'matched', 'modified', 'failed')}
+    return {'collection': name, 'batches': batches, **totals}
@@ -47,7 +47,7 @@ const Admin = () => {
     try {
       const token = localStorage.getItem('adminToken');
       const response = await fetch(
-        `${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/contact-messages`,
+        `${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/contact-messages/unread-count`,
         {
           headers: {
             'Authorization': `Bearer ${token}`,
@@ -56,8 +56,7 @@ const Admin = () => {
       );
       
       if (response.ok) {
-        const messages = await response.json();
-        const unread = messages.filter(msg => !msg.read).length;
+        const { unread } = await response.json();
         setUnreadCount(unread);
       }
     } catch (error) {
@@ -93,6 +92,14 @@ const Admin = () => {
   };
 
   const handleLogout = () => {
+    // Revoke the token on the server too; the local copy goes either way
+    const token = localStorage.getItem('adminToken');
+    fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/logout`, {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+      },
+    }).catch((error) => console.error('Error logging out:', error));
     localStorage.removeItem('adminToken');
     setIsAuthenticated(false);
     setUnreadCount(0);
@@ -1,20 +1,28 @@
 import React, { useState, useEffect } from 'react';
 import './ContactManager.css';
 
+const PAGE_SIZE = 50;
+
 const ContactManager = ({ setMessage, updateUnreadCount }) => {
   const [messages, setMessages] = useState([]);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [unreadTotal, setUnreadTotal] = useState(0);
   const [selectedMessage, setSelectedMessage] = useState(null);
 
   useEffect(() => {
     fetchMessages();
   }, []);
 
-  const fetchMessages = async () => {
-    setLoading(true);
+  // Newest messages first, PAGE_SIZE at a time; pass the cursor to load the next page
+  const fetchMessages = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true);
     try {
       const token = localStorage.getItem('adminToken');
-      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/contact-messages`, {
+      const params = new URLSearchParams({ limit: PAGE_SIZE });
+      if (cursor) params.set('cursor', cursor);
+      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/contact-messages?${params}`, {
         headers: {
           'Authorization': `Bearer ${token}`
         }
@@ -22,11 +30,9 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
       
       if (response.ok) {
         const data = await response.json();
-        setMessages(data);
-        
-        // Calculate unread count and update parent component
-        const unread = data.filter(msg => !msg.read).length;
-        updateUnreadCount(unread);
+        setMessages(prev => (cursor ? [...prev, ...data] : data));
+        setNextCursor(response.headers.get('X-Next-Cursor'));
+        fetchUnreadCount();
       } else {
         setMessage({ text: 'Failed to fetch messages', type: 'error' });
       }
@@ -34,7 +40,27 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
       console.error('Error:', error);
       setMessage({ text: 'Error fetching messages', type: 'error' });
     } finally {
-      setLoading(false);
+      cursor ? setLoadingMore(false) : setLoading(false);
+    }
+  };
+
+  // Counted on the server, so it includes messages on pages not loaded yet
+  const fetchUnreadCount = async () => {
+    try {
+      const token = localStorage.getItem('adminToken');
+      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/contact-messages/unread-count`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+
+      if (response.ok) {
+        const { unread } = await response.json();
+        setUnreadTotal(unread);
+        updateUnreadCount(unread);
+      }
+    } catch (error) {
+      console.error('Error fetching unread count:', error);
     }
   };
 
@@ -52,7 +78,9 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
       
       if (response.ok) {
         setMessage({ text: 'Message marked as read', type: 'success' });
-        fetchMessages();
+        setMessages(prev => prev.map(msg => (msg._id === id ? { ...msg, read: true } : msg)));
+        setSelectedMessage(prev => (prev && prev._id === id ? { ...prev, read: true } : prev));
+        fetchUnreadCount();
       } else {
         setMessage({ text: 'Failed to mark as read', type: 'error' });
       }
@@ -75,8 +103,9 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
         
         if (response.ok) {
           setMessage({ text: 'Message deleted successfully', type: 'success' });
-          fetchMessages();
+          setMessages(prev => prev.filter(msg => msg._id !== id));
           setSelectedMessage(null);
+          fetchUnreadCount();
         } else {
           setMessage({ text: 'Failed to delete message', type: 'error' });
         }
@@ -99,7 +128,9 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
       
       if (response.ok) {
         setMessage({ text: 'All messages marked as read', type: 'success' });
-        fetchMessages();
+        setMessages(prev => prev.map(msg => ({ ...msg, read: true })));
+        setSelectedMessage(prev => (prev ? { ...prev, read: true } : prev));
+        fetchUnreadCount();
       } else {
         setMessage({ text: 'Failed to mark all as read', type: 'error' });
       }
@@ -121,8 +152,8 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
       <div className="contact-header">
         <h2 className="section-title">Contact Messages</h2>
         <div className="header-actions">
-          <span className="message-count">{messages.length} messages</span>
-          {unreadMessages.length > 0 && (
+          <span className="message-count">{messages.length}{nextCursor ? '+' : ''} messages</span>
+          {unreadTotal > 0 && (
             <button onClick={markAllAsRead} className="btn btn-outline">
               Mark All as Read
             </button>
@@ -164,6 +195,16 @@ const ContactManager = ({ setMessage, updateUnreadCount }) => {
             </div>
           )}
           
+          {nextCursor && (
+            <button
+              onClick={() => fetchMessages(nextCursor)}
+              className="btn btn-outline"
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load Older Messages'}
+            </button>
+          )}
+          
           {messages.length === 0 && (
             <div className="empty-state">
               <div className="empty-icon">📭</div>
@@ -1,6 +1,10 @@
 import React, { useState, useEffect } from "react";
 import './FAQManager.css'; 
 
+const authHeaders = () => ({
+  Authorization: `Bearer ${localStorage.getItem('adminToken')}`,
+});
+
 const FAQManager = ({ setMessage }) => {
   const [faqs, setFaqs] = useState([]);
   const [submittedQuestions, setSubmittedQuestions] = useState([]);
@@ -39,7 +43,9 @@ const FAQManager = ({ setMessage }) => {
 
   const fetchFaqs = async () => {
     try {
-      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/faqs`);
+      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/faqs`, {
+        headers: authHeaders(),
+      });
       const data = await response.json();
       setFaqs(data);
     } catch (error) {
@@ -50,7 +56,9 @@ const FAQManager = ({ setMessage }) => {
 
   const fetchSubmittedQuestions = async () => {
     try {
-      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/submitted-questions`);
+      const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/submitted-questions`, {
+        headers: authHeaders(),
+      });
       const data = await response.json();
       setSubmittedQuestions(data);
     } catch (error) {
@@ -69,6 +77,7 @@ const FAQManager = ({ setMessage }) => {
         method,
         headers: {
           "Content-Type": "application/json",
+          ...authHeaders(),
         },
         body: JSON.stringify(editingFaq ? {...formData, id: editingFaq.id} : formData),
       });
@@ -92,6 +101,7 @@ const FAQManager = ({ setMessage }) => {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
+          ...authHeaders(),
         },
         body: JSON.stringify({ answer: answerText }),
       });
@@ -117,6 +127,7 @@ const FAQManager = ({ setMessage }) => {
     try {
       const response = await fetch(`${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001'}/api/admin/faqs?id=${id}`, {
         method: "DELETE",
+        headers: authHeaders(),
       });
 
       if (response.ok) {
@@ -603,7 +603,7 @@ const testiRes = await fetch(
         <div className="team-grid">
           {aboutData.team.map((member, i) => (
             <div className="team-member" key={i}>
-              <img src={getImageUrl(member.image)} alt={member.name} />
+              <img src={getImageUrl(member.image, { width: 128, format: "webp" })} alt={member.name} />
               <h4>{member.name}</h4>
               <p>{member.role}</p>
             </div>
@@ -649,7 +649,7 @@ const testiRes = await fetch(
                   <h3>{t.name}</h3>
                   <h6>{t.role}</h6>
                 </div>
-                <img src={getImageUrl(t.img)} alt={t.name} />
+                <img src={getImageUrl(t.img, { width: 128, format: "webp" })} alt={t.name} />
               </div>
             </div>
           ))}
@@ -38,16 +38,13 @@ const BlogDetails = () => {
         }
         setBlog(blogData);
 
-        if (blogData.category) {
-          const excludeId = blogData.id || blogData._id;
-          const relatedResponse = await fetch(
-            `${import.meta.env.VITE_API_BASE_URL}/api/blogs?category=${blogData.category}&limit=3&exclude=${excludeId}`
-          );
+        const relatedResponse = await fetch(
+          `${import.meta.env.VITE_API_BASE_URL}/api/blogs/${id}/related?limit=3`
+        );
 
-          if (relatedResponse.ok) {
-            const relatedData = await relatedResponse.json();
-            setRelatedBlogs(relatedData);
-          }
+        if (relatedResponse.ok) {
+          const relatedData = await relatedResponse.json();
+          setRelatedBlogs(relatedData);
         }
       } catch (err) {
         console.error("Error fetching blog:", err);
@@ -134,7 +131,7 @@ const BlogDetails = () => {
           {relatedBlogs.map((relatedBlog) => (
             <div className="cardss" key={relatedBlog._id}>
               <img
-                src={getImageUrl(relatedBlog.image)}
+                src={getImageUrl(relatedBlog.image, { width: 480, format: "webp" })}
                 alt={relatedBlog.title}
               />
               <div className="cardss-body">
@@ -163,7 +163,7 @@ const Blogs = () => {
       <div className="card-grids">
         {gridBlogs.map((blog, index) => (
           <div className="cardd" key={index}>
-            <img src={getImageUrl(blog.image)} alt={blog.title} />
+            <img src={getImageUrl(blog.image, { width: 480, format: "webp" })} alt={blog.title} />
             <div className="cardd-body">
               <span className="category">{blog.category}</span>
               <h3 className="titles">{blog.title}</h3>
@@ -613,28 +613,17 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // Fetch home data
-        const homeRes = await fetch(`${import.meta.env.VITE_API_BASE_URL}/api/home`);
-        const homeData = await homeRes.json();
-        setHomeData(homeData);
-
-        // Fetch all other data in parallel
-        const [servicesRes, projectsRes, testimonialsRes, clientsRes, faqsRes, pricingRes] =
-          await Promise.all([
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/services`),
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/projects`),
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/testimonials`),
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/clients`),
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/faqs`),
-            fetch(`${import.meta.env.VITE_API_BASE_URL}/api/pricing`),
-          ]);
-
-        setServices(await servicesRes.json());
-        setProjects(await projectsRes.json());
-        setTestimonials(await testimonialsRes.json());
-        setClients(await clientsRes.json());
-        setFaqs(await faqsRes.json());
-        setPricing(await pricingRes.json());
+        // Fetch the whole page in one request
+        const pageRes = await fetch(`${import.meta.env.VITE_API_BASE_URL}/api/pages/home`);
+        const page = await pageRes.json();
+
+        setHomeData(page.home);
+        setServices(page.services);
+        setProjects(page.projects);
+        setTestimonials(page.testimonials);
+        setClients(page.clients);
+        setFaqs(page.faqs);
+        setPricing(page.pricing);
       } catch (error) {
         console.error("Error fetching data:", error);
       } finally {
@@ -822,7 +811,7 @@ const Home = () => {
       <div className="about-container">
         <div className="about-logo">
           <img
-            src={getImageUrl(homeData.about?.logo)}
+            src={getImageUrl(homeData.about?.logo, { width: 256, format: "webp" })}
             alt="About Logo"
             className="logo-img"
           />
@@ -886,7 +875,7 @@ const Home = () => {
                     <h6>{testimonial.role}</h6>
                   </div>
                   <img
-                    src={getImageUrl(testimonial.img || testimonial.image)}
+                    src={getImageUrl(testimonial.img || testimonial.image, { width: 128, format: "webp" })}
                     alt={testimonial.name}
                     className="user-avatar"
                   />
@@ -960,7 +949,7 @@ const Home = () => {
             {clients.map((client) => (
               <div className="client-card" key={client.id || client._id}>
                 <img
-                  src={getImageUrl(client.logo)}
+                  src={getImageUrl(client.logo, { width: 256, format: "webp" })}
                   alt={client.name || `Client ${client.id}`}
                   className="client-logo"
                 />
@@ -51,22 +51,13 @@ const Pricing = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [pricingRes, testimonialsRes, clientsRes, faqsRes] = await Promise.all([
-          fetch(`${import.meta.env.VITE_API_BASE_URL}/api/pricing`),
-          fetch(`${import.meta.env.VITE_API_BASE_URL}/api/testimonials`),
-          fetch(`${import.meta.env.VITE_API_BASE_URL}/api/clients`),
-          fetch(`${import.meta.env.VITE_API_BASE_URL}/api/faqs`),
-        ]);
-
-        const pricingData = await pricingRes.json();
-        const testimonialsData = await testimonialsRes.json();
-        const clientsData = await clientsRes.json();
-        const faqsData = await faqsRes.json();
-
-        setPricingPlans(pricingData);
-        setTestimonials(testimonialsData);
-        setClients(clientsData);
-        setFaqs(faqsData);
+        const pageRes = await fetch(`${import.meta.env.VITE_API_BASE_URL}/api/pages/pricing`);
+        const page = await pageRes.json();
+
+        setPricingPlans(page.pricing);
+        setTestimonials(page.testimonials);
+        setClients(page.clients);
+        setFaqs(page.faqs);
       } catch (error) {
         console.error("Error fetching data:", error);
       } finally {
@@ -152,7 +143,7 @@ const Pricing = () => {
                   <h3>{testimonial.name}</h3>
                   <h6>{testimonial.role}</h6>
                 </div>
-                <img src={getImageUrl(testimonial.img)} alt={testimonial.name} />
+                <img src={getImageUrl(testimonial.img, { width: 128, format: "webp" })} alt={testimonial.name} />
               </div>
             </div>
           ))}
@@ -166,7 +157,7 @@ const Pricing = () => {
         <div className="clients-grid">
           {clients.map((client) => (
             <div className="client-card" key={client.id}>
-              <img src={getImageUrl(client.logo)} alt={client.name || "Client"} />
+              <img src={getImageUrl(client.logo, { width: 256, format: "webp" })} alt={client.name || "Client"} />
             </div>
           ))}
         </div>
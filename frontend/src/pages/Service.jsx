@@ -145,7 +145,7 @@ const Service = () => {
                   <h3>{t.name}</h3>
                   <h6>{t.role}</h6>
                 </div>
-                <img src={getImageUrl(t.img)} alt={t.name} />
+                <img src={getImageUrl(t.img, { width: 128, format: "webp" })} alt={t.name} />
               </div>
             </div>
           ))}
@@ -117,7 +117,7 @@ const Service = () => {
                   <h6>{t.role}</h6>
                 </div>
                 <img 
-                  src={getImageUrl(t.img)} 
+                  src={getImageUrl(t.img, { width: 128, format: "webp" })} 
                   alt={t.name}
                   onError={(e) => {
                     e.target.onerror = null;
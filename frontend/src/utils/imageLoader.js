@@ -7,7 +7,9 @@
 
 
 
-export const getImageUrl = (path) => {
+// Pass { width, format } to get a resized variant from the backend,
+// e.g. getImageUrl(client.logo, { width: 128, format: "webp" })
+export const getImageUrl = (path, { width, format } = {}) => {
   if (!path) return "";
   
   // If it's already a full URL, return as is
@@ -21,6 +23,8 @@ export const getImageUrl = (path) => {
   // Handle URL encoding for special characters
   try {
     const url = new URL(path, baseUrl);
+    if (width) url.searchParams.set("w", width);
+    if (format) url.searchParams.set("format", format);
     return url.href;
   } catch (e) {
     console.error("Error creating image URL:", e);